@@ -1,4 +1,5 @@
 import os
+import tempfile
 from dotenv import load_dotenv
 from urllib.parse import urlencode
 
@@ -33,5 +34,130 @@ SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL')
 # Image settings
 IMAGE_CACHE_DIR = 'static/images/generated'
 IMAGE_CACHE_TIME = 3600  # 1 hour
+IMAGE_CACHE_MAX_BYTES = int(os.getenv('IMAGE_CACHE_MAX_BYTES', 200 * 1024 * 1024))
+# LRU manifest shared by the workers on a container, kept out of the static folder
+IMAGE_CACHE_MANIFEST = os.getenv(
+    'IMAGE_CACHE_MANIFEST',
+    os.path.join(tempfile.gettempdir(), 'image_cache_manifest.sqlite3')
+)
 MAX_IMAGE_SIZE = (800, 800)
-IMAGE_QUALITY = 85
\ No newline at end of file
+IMAGE_QUALITY = 85
+
+# Bounded in-memory indexes (entries, seconds) kept by long-lived workers
+IMAGE_INDEX_MAX = 2000
+USED_IMAGES_MAX = 2000
+USED_IMAGES_TTL = 24 * 3600
+SEEN_ARTICLES_MAX = 5000
+SEEN_ARTICLES_TTL = 48 * 3600
+INGEST_LEDGER_RETENTION_DAYS = 30
+
+# News API delta polling: requests per UTC day across all workers, page size, pages per cycle,
+# new articles that are enough for one cycle, and article ids remembered as already seen
+NEWS_DAILY_REQUEST_BUDGET = int(os.getenv('NEWS_DAILY_REQUEST_BUDGET', 180))
+NEWS_PAGE_SIZE = 10
+NEWS_POLL_MAX_PAGES = 3
+NEWS_POLL_TARGET = 10
+NEWS_KNOWN_IDS = 500
+
+# Forced news refreshes: minimum seconds between API polls, seconds a caller waits to join
+# a refresh already running, and the advisory lock namespace for single-flight keys
+NEWS_FORCE_REFRESH_MIN_INTERVAL = 300
+NEWS_REFRESH_WAIT = 90
+SINGLE_FLIGHT_LOCK_NAMESPACE = 724221
+
+# Missing news images waiting for background regeneration
+IMAGE_REGEN_QUEUE_SIZE = 100
+
+# Podcast feed pagination
+PODCAST_PAGE_SIZE = 12
+PODCAST_PAGE_MAX = 50
+
+# Write-behind counter buffer (views/likes)
+COUNTER_FLUSH_INTERVAL_MS = 500
+
+# Waveform peaks (decoded server-side with ffmpeg)
+FFMPEG_BINARY = os.getenv('FFMPEG_BINARY', 'ffmpeg')
+WAVEFORM_SAMPLE_RATE = 8000
+WAVEFORM_PEAKS_COUNT = 1000
+WAVEFORM_DECODE_TIMEOUT = 600  # Seconds before a stalled ffmpeg decode is killed
+
+# Multi-resolution waveform pyramid, finest level first (samples per pixel at WAVEFORM_SAMPLE_RATE)
+WAVEFORM_PYRAMID_LEVELS = (64, 256, 1024, 4096)
+WAVEFORM_DIR = 'static/waveforms'
+
+# Uploads are spooled to disk and sent to Cloudinary in fixed-size parts (minimum part size is 5MB)
+UPLOAD_TMP_DIR = os.getenv('UPLOAD_TMP_DIR')  # None = system temp dir
+UPLOAD_CHUNK_SIZE = 6 * 1024 * 1024
+UPLOAD_BUFFER_SIZE = 1024 * 1024
+MAX_VIDEO_SIZE = 500 * 1024 * 1024
+
+# Background upload processing (Cloudinary transfer, transformations, DB insert)
+UPLOAD_WORKERS = int(os.getenv('UPLOAD_WORKERS', 2))
+JOB_HEARTBEAT_INTERVAL = 30  # Seconds between updated_at bumps for jobs a worker holds
+JOB_STALE_SECONDS = 300  # Queued/running jobs without a heartbeat this long died with their worker
+
+# Resumable (tus-style) chunked uploads, assembled on local disk before processing
+RESUMABLE_UPLOAD_DIR = os.getenv('RESUMABLE_UPLOAD_DIR')  # None = <system temp dir>/resumable_uploads
+RESUMABLE_CHUNK_SIZE = 8 * 1024 * 1024
+RESUMABLE_UPLOAD_EXPIRY_HOURS = 24
+
+# Direct browser-to-Cloudinary uploads (Cloudinary itself rejects signatures older than 1 hour)
+DIRECT_UPLOAD_CHUNK_SIZE = 20 * 1024 * 1024
+DIRECT_UPLOAD_TOKEN_MAX_AGE = 6 * 60 * 60  # Time allowed between signing and completion
+
+# Rendered-page cache (Flask-Caching). FileSystemCache is shared by all gunicorn workers in the container
+CACHE_TYPE = os.getenv('CACHE_TYPE', 'FileSystemCache')
+CACHE_DIR = os.getenv('CACHE_DIR', os.path.join(tempfile.gettempdir(), 'page_cache'))
+CACHE_DEFAULT_TIMEOUT = 300
+CACHE_THRESHOLD = 1000
+PAGE_CACHE_TIMEOUT = 60  # Upper bound on how stale view/like counts on cached pages can be
+
+# Scheduler leader election (Postgres session advisory lock, released when the holder's connection closes)
+SCHEDULER_LEADER_LOCK_ID = 724221001
+LEADER_HEARTBEAT_INTERVAL = 10  # seconds between leader lock checks
+LEADER_RETRY_INTERVAL = 15  # seconds between follower acquisition attempts
+
+# News ingestion cadence, shared by the scheduler and the news page snapshot
+NEWS_UPDATE_INTERVAL = 3600
+
+# Background dependency probes behind /api/system/status (seconds between checks)
+STATUS_PROBE_INTERVALS = {
+    'database': 30,
+    'scheduler': 30,
+    'news': 60,
+    'twitter': 300
+}
+
+# News ingestion pipeline: worker threads per stage and the bounded queue between stages
+NEWS_PIPELINE_WORKERS = {
+    'extract': int(os.getenv('NEWS_EXTRACT_WORKERS', 6)),
+    'download': int(os.getenv('NEWS_DOWNLOAD_WORKERS', 6)),
+    'compress': int(os.getenv('NEWS_COMPRESS_WORKERS', 2))
+}
+NEWS_PIPELINE_QUEUE_SIZE = 8
+
+# Article page image extraction: bytes read looking for <head> meta images, then for an <article> image
+ARTICLE_HEAD_BYTES = 256 * 1024
+ARTICLE_SCAN_BYTES = 1024 * 1024
+
+# Outbound HTTP per dependency: (connect, read) timeouts, retries of idempotent requests,
+# pooled hosts and connections per host, and the largest response body accepted
+HTTP_PROFILES = {
+    'newsdata': {'connect': 5, 'read': 15, 'retries': 2, 'hosts': 1, 'connections': 4, 'max_bytes': 5 * 1024 * 1024},
+    'unsplash': {'connect': 3, 'read': 10, 'retries': 2, 'hosts': 1, 'connections': 8, 'max_bytes': 1024 * 1024},
+    'images': {'connect': 3, 'read': 10, 'retries': 1, 'hosts': 32, 'connections': 4, 'max_bytes': 15 * 1024 * 1024},
+    'articles': {'connect': 3, 'read': 5, 'retries': 1, 'hosts': 32, 'connections': 4, 'max_bytes': ARTICLE_SCAN_BYTES},
+    'cloudinary': {'connect': 5, 'read': 30, 'retries': 2, 'hosts': 4, 'connections': 8, 'max_bytes': None}
+}
+
+# Circuit breakers per outbound dependency (same names as HTTP_PROFILES): rolling window of calls,
+# failure rate that opens it once min_calls are in, seconds open before half-open probing,
+# probe calls allowed while half-open, and the bulkhead cap on concurrent calls
+BREAKER_SETTINGS = {
+    'newsdata': {'window': 10, 'min_calls': 3, 'failure_rate': 0.5, 'open_seconds': 300, 'half_open_calls': 1, 'max_concurrent': 2},
+    'unsplash': {'window': 20, 'min_calls': 5, 'failure_rate': 0.5, 'open_seconds': 120, 'half_open_calls': 1, 'max_concurrent': 4},
+    'images': {'window': 40, 'min_calls': 10, 'failure_rate': 0.6, 'open_seconds': 60, 'half_open_calls': 2, 'max_concurrent': 8},
+    'articles': {'window': 40, 'min_calls': 10, 'failure_rate': 0.6, 'open_seconds': 60, 'half_open_calls': 2, 'max_concurrent': 8},
+    'cloudinary': {'window': 20, 'min_calls': 5, 'failure_rate': 0.5, 'open_seconds': 60, 'half_open_calls': 1, 'max_concurrent': 8}
+}
+BREAKER_PUBLISH_INTERVAL = 30  # Seconds between the leader writing breaker state for the other workers
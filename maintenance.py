@@ -184,6 +184,41 @@ def check_database():
         logging.error(f"❌ Database error: {e}")
         return False
 
+def backfill_waveforms():
+    """Compute waveform peaks and zoom pyramids for podcasts uploaded before they existed"""
+    try:
+        from app import Podcast
+        from models.base import db_session
+        from services.waveform_service import WaveformService
+        
+        podcasts = Podcast.query.filter(
+            (Podcast.peaks.is_(None)) | (Podcast.waveform_url.is_(None))
+        ).order_by(Podcast.id).all()
+        logging.info(f"Backfilling waveforms for {len(podcasts)} podcasts...")
+        
+        failed = 0
+        for podcast in podcasts:
+            try:
+                waveform = WaveformService.build_waveform(podcast.audio_url)
+                podcast.peaks = waveform['peaks']
+                if not podcast.duration:
+                    podcast.duration = waveform['duration']
+                if podcast.cloudinary_public_id:
+                    podcast.waveform_url = WaveformService.store_pyramid(
+                        waveform['pyramid'], podcast.cloudinary_public_id
+                    )
+                db_session.commit()
+                logging.info(f"✅ Waveform built for podcast {podcast.id}: {podcast.title}")
+            except Exception as e:
+                db_session.rollback()
+                failed += 1
+                logging.error(f"❌ Waveform failed for podcast {podcast.id}: {e}")
+        
+        return failed == 0
+    except Exception as e:
+        logging.error(f"❌ Error backfilling waveforms: {e}")
+        return False
+
 def run_all_checks():
     """Run all checks and report status"""
     results = {}
@@ -215,6 +250,7 @@ def main():
     parser.add_argument('--scheduler', action='store_true', help='Check scheduler')
     parser.add_argument('--restart-scheduler', action='store_true', help='Restart scheduler')
     parser.add_argument('--database', action='store_true', help='Check database')
+    parser.add_argument('--backfill-waveforms', action='store_true', help='Compute missing waveform peaks and zoom pyramids')
     
     args = parser.parse_args()
     
@@ -248,6 +284,9 @@ def main():
         
     if args.database:
         check_database()
+        
+    if args.backfill_waveforms:
+        backfill_waveforms()
 
 if __name__ == '__main__':
     main()
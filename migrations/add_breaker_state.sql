@@ -0,0 +1,7 @@
+-- migrations/add_breaker_state.sql
+-- Circuit breaker state published by the scheduler leader, read by every worker's admin page
+CREATE TABLE IF NOT EXISTS breaker_state (
+    name VARCHAR(50) PRIMARY KEY,
+    snapshot JSON,
+    updated_at TIMESTAMP WITHOUT TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
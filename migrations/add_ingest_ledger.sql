@@ -0,0 +1,8 @@
+CREATE TABLE IF NOT EXISTS ingest_ledger (
+    content_hash VARCHAR(32) PRIMARY KEY,
+    source_url TEXT,
+    image_path TEXT,
+    processed_at TIMESTAMP WITHOUT TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS ix_ingest_ledger_processed_at ON ingest_ledger (processed_at);
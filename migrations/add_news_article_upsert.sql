@@ -0,0 +1,8 @@
+-- Articles are upserted on their content hash and switched onto the front page with is_current
+ALTER TABLE news_articles ADD COLUMN IF NOT EXISTS article_hash VARCHAR(32);
+ALTER TABLE news_articles ADD COLUMN IF NOT EXISTS is_current BOOLEAN NOT NULL DEFAULT FALSE;
+ALTER TABLE news_articles ADD COLUMN IF NOT EXISTS rank INTEGER;
+ALTER TABLE news_articles ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP WITHOUT TIME ZONE DEFAULT CURRENT_TIMESTAMP;
+
+CREATE UNIQUE INDEX IF NOT EXISTS ux_news_articles_article_hash ON news_articles (article_hash);
+CREATE INDEX IF NOT EXISTS ix_news_articles_current ON news_articles (rank) WHERE is_current;
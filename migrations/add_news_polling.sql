@@ -0,0 +1,14 @@
+CREATE TABLE IF NOT EXISTS news_poll_state (
+    name VARCHAR(50) PRIMARY KEY,
+    newest_published_at TIMESTAMP WITHOUT TIME ZONE,
+    known_ids JSON,
+    last_cycle JSON,
+    updated_at TIMESTAMP WITHOUT TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS api_quota (
+    api VARCHAR(50) NOT NULL,
+    day DATE NOT NULL,
+    requests INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (api, day)
+);
@@ -0,0 +1,5 @@
+CREATE TABLE IF NOT EXISTS news_snapshots (
+    name VARCHAR(50) PRIMARY KEY,
+    payload JSON NOT NULL,
+    created_at TIMESTAMP WITHOUT TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
@@ -0,0 +1,3 @@
+-- migrations/add_podcast_feed_index.sql
+-- Composite index backing keyset pagination of the home feed on (created_at, id)
+CREATE INDEX IF NOT EXISTS ix_podcasts_created_at_id ON podcasts (created_at DESC, id DESC);
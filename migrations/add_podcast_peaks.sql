@@ -0,0 +1,3 @@
+-- migrations/add_podcast_peaks.sql
+-- Precomputed, normalized waveform peaks served by /podcast/<id>/peaks
+ALTER TABLE podcasts ADD COLUMN IF NOT EXISTS peaks JSON;
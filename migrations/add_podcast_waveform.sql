@@ -0,0 +1,3 @@
+-- migrations/add_podcast_waveform.sql
+-- Location of the multi-resolution binary waveform pyramid served by /podcast/<id>/waveform
+ALTER TABLE podcasts ADD COLUMN IF NOT EXISTS waveform_url VARCHAR(500);
@@ -0,0 +1,11 @@
+CREATE TABLE IF NOT EXISTS scheduler_jobs (
+    name VARCHAR(50) PRIMARY KEY,
+    status VARCHAR(20) DEFAULT 'idle',
+    last_run TIMESTAMP WITHOUT TIME ZONE,
+    last_success TIMESTAMP WITHOUT TIME ZONE,
+    next_run TIMESTAMP WITHOUT TIME ZONE,
+    duration DOUBLE PRECISION,
+    failures INTEGER DEFAULT 0,
+    error TEXT,
+    updated_at TIMESTAMP WITHOUT TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
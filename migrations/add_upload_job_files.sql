@@ -0,0 +1,5 @@
+-- migrations/add_upload_job_files.sql
+-- Spooled files a job owns, so jobs orphaned by a dead worker can be failed and their files removed
+ALTER TABLE upload_jobs ADD COLUMN IF NOT EXISTS files JSON;
+
+CREATE INDEX IF NOT EXISTS ix_upload_jobs_active ON upload_jobs (updated_at) WHERE status IN ('queued', 'running');
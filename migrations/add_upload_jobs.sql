@@ -0,0 +1,13 @@
+CREATE TABLE IF NOT EXISTS upload_jobs (
+    id VARCHAR(32) PRIMARY KEY,
+    kind VARCHAR(20) NOT NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'queued',
+    stage VARCHAR(100),
+    progress INTEGER DEFAULT 0,
+    result JSON,
+    error TEXT,
+    created_at TIMESTAMP WITHOUT TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP WITHOUT TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS ix_upload_jobs_created_at ON upload_jobs (created_at);
@@ -0,0 +1,4 @@
+-- migrations/add_upload_public_id_index.sql
+-- One row per Cloudinary asset, so a replayed direct upload completion can't insert a duplicate
+CREATE UNIQUE INDEX IF NOT EXISTS ux_podcasts_cloudinary_public_id ON podcasts (cloudinary_public_id);
+CREATE UNIQUE INDEX IF NOT EXISTS ux_videos_cloudinary_public_id ON videos (cloudinary_public_id);
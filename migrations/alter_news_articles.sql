@@ -1,8 +1,5 @@
--- Drop existing table
-DROP TABLE IF EXISTS news_articles;
-
--- Recreate with new schema
-CREATE TABLE news_articles (
+-- Create if missing, existing articles are kept as the archive
+CREATE TABLE IF NOT EXISTS news_articles (
     id SERIAL PRIMARY KEY,
     title VARCHAR(500) NOT NULL,
     description TEXT,
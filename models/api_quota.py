@@ -0,0 +1,11 @@
+# models/api_quota.py
+from models.base import Base
+from sqlalchemy import Column, Integer, String, Date
+
+class ApiQuota(Base):
+    """Requests made to a metered API per UTC day, shared by every worker"""
+    __tablename__ = 'api_quota'
+
+    api = Column(String(50), primary_key=True)  # 'newsdata'
+    day = Column(Date, primary_key=True)
+    requests = Column(Integer, default=0, nullable=False)
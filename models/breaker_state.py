@@ -0,0 +1,11 @@
+# models/breaker_state.py
+from datetime import datetime
+from models.base import Base
+from sqlalchemy import Column, String, DateTime, JSON
+
+class BreakerState(Base):
+    __tablename__ = 'breaker_state'
+
+    name = Column(String(50), primary_key=True)  # Dependency, as in BREAKER_SETTINGS
+    snapshot = Column(JSON)  # CircuitBreaker.to_dict() in the scheduler leader
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean, JSON
 from datetime import datetime
 from models.base import Base
 
@@ -15,6 +15,10 @@ class NewsArticle(Base):
     category = Column(String(50))  # 'breaking', 'tech', 'tech_politics'
     is_breaking = Column(Boolean, default=False)
     created_at = Column(DateTime, default=datetime.utcnow)
+    article_hash = Column(String(32), unique=True)  # Content hash, the upsert key
+    is_current = Column(Boolean, default=False, nullable=False)  # On the front page, the rest is archive
+    rank = Column(Integer)  # Front page position, breaking first
+    updated_at = Column(DateTime, default=datetime.utcnow)
 
     def to_dict(self):
         return {
@@ -27,4 +31,31 @@ class NewsArticle(Base):
             'source': self.source,
             'category': self.category,
             'is_breaking': self.is_breaking
-        }
\ No newline at end of file
+        }
+
+class IngestLedger(Base):
+    """Articles already ingested, keyed by content hash, so no worker processes one twice"""
+    __tablename__ = 'ingest_ledger'
+
+    content_hash = Column(String(32), primary_key=True)
+    source_url = Column(Text)
+    image_path = Column(Text)  # Resolved image under static/, NULL when none was found
+    processed_at = Column(DateTime, default=datetime.utcnow, index=True)
+
+class NewsPollState(Base):
+    """Delta polling cursor for a news API: the newest article seen and recent article ids"""
+    __tablename__ = 'news_poll_state'
+
+    name = Column(String(50), primary_key=True)  # 'newsdata'
+    newest_published_at = Column(DateTime)
+    known_ids = Column(JSON)  # Most recent article ids, oldest first
+    last_cycle = Column(JSON)  # Requests, pages and new articles of the last poll
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class NewsSnapshot(Base):
+    """Precomputed news page state, written by the news job and read once per page render"""
+    __tablename__ = 'news_snapshots'
+
+    name = Column(String(50), primary_key=True)
+    payload = Column(JSON, nullable=False)  # breaking, other, next_update
+    created_at = Column(DateTime, default=datetime.utcnow)
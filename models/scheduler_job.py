@@ -0,0 +1,30 @@
+# models/scheduler_job.py
+from datetime import datetime
+from models.base import Base
+from sqlalchemy import Column, Integer, String, DateTime, Text, Float
+
+class SchedulerJob(Base):
+    __tablename__ = 'scheduler_jobs'
+
+    name = Column(String(50), primary_key=True)  # 'news', 'twitter', 'cleanup'
+    status = Column(String(20), default='idle')  # 'idle', 'running', 'succeeded', 'failed'
+    last_run = Column(DateTime)
+    last_success = Column(DateTime)
+    next_run = Column(DateTime)
+    duration = Column(Float)  # Seconds taken by the last run
+    failures = Column(Integer, default=0)  # Consecutive failed runs
+    error = Column(Text)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'status': self.status,
+            'last_run': self.last_run.isoformat() if self.last_run else None,
+            'last_success': self.last_success.isoformat() if self.last_success else None,
+            'next_run': self.next_run.isoformat() if self.next_run else None,
+            'duration': self.duration,
+            'failures': self.failures,
+            'error': self.error,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
@@ -0,0 +1,32 @@
+# models/upload_job.py
+from datetime import datetime
+import secrets
+from models.base import Base
+from sqlalchemy import Column, Integer, String, DateTime, Text, JSON
+
+class UploadJob(Base):
+    __tablename__ = 'upload_jobs'
+
+    id = Column(String(32), primary_key=True, default=lambda: secrets.token_hex(16))
+    kind = Column(String(20), nullable=False)  # 'podcast', 'video'
+    status = Column(String(20), nullable=False, default='queued')  # 'queued', 'running', 'done', 'failed'
+    stage = Column(String(100))
+    progress = Column(Integer, default=0)  # 0-100
+    result = Column(JSON)
+    error = Column(Text)
+    files = Column(JSON)  # Spooled uploads the job owns, removed if it's reaped
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'kind': self.kind,
+            'status': self.status,
+            'stage': self.stage,
+            'progress': self.progress,
+            'result': self.result,
+            'error': self.error,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
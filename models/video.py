@@ -1,6 +1,6 @@
 # models/video.py
 from models.base import Base
-from sqlalchemy import Column, Integer, String, Text, DateTime, JSON, Float
+from sqlalchemy import Column, Integer, String, Text, DateTime, JSON, Float, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import secrets
@@ -21,6 +21,10 @@ class Video(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     comments = Column(JSON, default=lambda: [])
 
+    __table_args__ = (
+        Index('ux_videos_cloudinary_public_id', cloudinary_public_id, unique=True),
+    )
+
     def __init__(self, **kwargs):
         super(Video, self).__init__(**kwargs)
         if not self.slug:
@@ -0,0 +1,193 @@
+# services/breaker_service.py
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+import logging
+import requests
+from models.base import db_session
+from models.breaker_state import BreakerState
+from config import BREAKER_SETTINGS
+
+class DependencyUnavailable(requests.exceptions.RequestException):
+    """Call refused without touching the network: breaker open or bulkhead full"""
+
+class _Call:
+    failed = False
+
+class CircuitBreaker:
+    """Per-dependency circuit breaker with a bulkhead.
+
+    Closed: calls go through and outcomes land in a rolling window; once at
+    least min_calls are recorded and failure_rate of them failed, it opens.
+    Open: calls are refused for open_seconds, then it goes half-open and lets
+    half_open_calls probe calls through. One probe success closes it, one failure
+    reopens it. Only probes admitted in the current half-open period decide
+    that; calls admitted while closed that finish later are ignored. In every
+    state at most max_concurrent calls run at once.
+
+    Breakers live in each process. The scheduler leader, which makes the
+    outbound ingestion calls, publishes its breakers to breaker_state for the
+    admin pages of every worker.
+    """
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    _breakers = {}
+    _registry_lock = threading.Lock()
+
+    def __init__(self, name, window, min_calls, failure_rate, open_seconds, half_open_calls, max_concurrent):
+        self.name = name
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.open_seconds = open_seconds
+        self.half_open_calls = half_open_calls
+        self.max_concurrent = max_concurrent
+
+        self.state = self.CLOSED
+        self.results = deque(maxlen=window)
+        self.opened_at = None
+        self.probes = 0
+        self.half_open_period = 0  # Tells this half-open period's probes from earlier ones
+        self.in_flight = 0
+        self.rejected = 0
+        self.last_failure = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def get(cls, name):
+        breaker = cls._breakers.get(name)
+        if breaker is None:
+            with cls._registry_lock:
+                breaker = cls._breakers.get(name)
+                if breaker is None:
+                    breaker = cls._breakers[name] = cls(name, **BREAKER_SETTINGS[name])
+        return breaker
+
+    @classmethod
+    def snapshot(cls):
+        """State of every breaker created in this process"""
+        return [cls._breakers[name].to_dict() for name in sorted(cls._breakers)]
+
+    @classmethod
+    def publish(cls):
+        """Write this process's breakers to breaker_state, called by the scheduler leader"""
+        now = datetime.utcnow()
+        try:
+            for breaker in cls.snapshot():
+                db_session.merge(BreakerState(name=breaker['name'], snapshot=breaker, updated_at=now))
+            db_session.commit()
+        except Exception:
+            db_session.rollback()
+            raise
+
+    @staticmethod
+    def published():
+        """Breaker states last published by the scheduler leader, for the admin pages"""
+        try:
+            return [
+                dict(row.snapshot, published_at=row.updated_at.isoformat())
+                for row in BreakerState.query.order_by(BreakerState.name).all()
+            ]
+        except Exception as e:
+            db_session.rollback()
+            logging.error(f"Error loading published breaker state: {e}")
+            return []
+
+    @contextmanager
+    def guard(self, ignore=()):
+        """Admit one call or raise DependencyUnavailable.
+
+        The call counts as failed if the block raises (except for `ignore`
+        exceptions) or sets `failed` on the yielded call.
+        """
+        probe = self._admit()
+        call = _Call()
+        failed = True
+        try:
+            yield call
+            failed = call.failed
+        except ignore:
+            failed = False
+            raise
+        finally:
+            self._record(not failed, probe)
+
+    def _admit(self):
+        """Take a slot, returning the half-open period for probe calls and None otherwise"""
+        with self._lock:
+            if self.state == self.OPEN:
+                if time.monotonic() - self.opened_at < self.open_seconds:
+                    self._reject('circuit open')
+                self.state = self.HALF_OPEN
+                self.probes = 0
+                self.half_open_period += 1
+
+            if self.in_flight >= self.max_concurrent:
+                self._reject(f'bulkhead full ({self.max_concurrent} calls in flight)')
+
+            probe = None
+            if self.state == self.HALF_OPEN:
+                if self.probes >= self.half_open_calls:
+                    self._reject('circuit half-open, probe in flight')
+                self.probes += 1
+                probe = self.half_open_period
+
+            self.in_flight += 1
+            return probe
+
+    def _reject(self, reason):
+        self.rejected += 1
+        raise DependencyUnavailable(f"{self.name}: {reason}")
+
+    def _record(self, ok, probe):
+        with self._lock:
+            self.in_flight -= 1
+            if not ok:
+                self.last_failure = datetime.utcnow()
+
+            if probe is not None:
+                # A probe from a period that already closed or reopened the breaker is stale
+                if self.state == self.HALF_OPEN and probe == self.half_open_period:
+                    self.probes -= 1
+                    if ok:
+                        self.state = self.CLOSED
+                        self.results.clear()
+                    else:
+                        self._open()
+                return
+
+            if self.state != self.CLOSED:
+                # Admitted while closed but finished after it opened, the probes decide now
+                return
+
+            self.results.append(ok)
+            failures = self.results.count(False)
+            if len(self.results) >= self.min_calls and failures / len(self.results) >= self.failure_rate:
+                self._open()
+
+    def _open(self):
+        self.state = self.OPEN
+        self.opened_at = time.monotonic()
+        self.results.clear()
+
+    def to_dict(self):
+        with self._lock:
+            retry_at = None
+            if self.state == self.OPEN:
+                remaining = self.open_seconds - (time.monotonic() - self.opened_at)
+                retry_at = (datetime.utcnow() + timedelta(seconds=max(0, remaining))).isoformat()
+            calls = len(self.results)
+            return {
+                'name': self.name,
+                'state': self.state,
+                'failure_rate': round(self.results.count(False) / calls, 2) if calls else 0.0,
+                'calls': calls,
+                'in_flight': self.in_flight,
+                'max_concurrent': self.max_concurrent,
+                'rejected': self.rejected,
+                'last_failure': self.last_failure.isoformat() if self.last_failure else None,
+                'retry_at': retry_at
+            }
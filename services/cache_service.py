@@ -0,0 +1,194 @@
+# services/cache_service.py
+import logging
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from urllib.parse import urlencode
+from flask import Response, g, make_response, request
+from flask_caching import Cache
+from config import PAGE_CACHE_TIMEOUT
+
+cache = Cache()
+
+class TTLCache:
+    """Thread-safe mapping capped at maxsize entries, each living at most ttl seconds.
+
+    Past maxsize the least recently used entry is dropped, so memory stays
+    flat however long the worker runs. Works as a set too (add, in, discard),
+    and counts hits, misses and evictions for monitoring.
+    """
+    _MISSING = object()
+
+    def __init__(self, name, maxsize, ttl):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data = OrderedDict()  # key -> (expires at, value), least recently used first
+        self._lock = threading.Lock()
+
+    def _lookup(self, key):
+        entry = self._data.get(key)
+        if entry is not None and entry[0] <= time.monotonic():
+            del self._data[key]
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return self._MISSING
+        self.hits += 1
+        self._data.move_to_end(key)
+        return entry[1]
+
+    def _store(self, key, value):
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def get(self, key, default=None):
+        with self._lock:
+            value = self._lookup(key)
+        return default if value is self._MISSING else value
+
+    def __getitem__(self, key):
+        value = self.get(key, self._MISSING)
+        if value is self._MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            self._store(key, value)
+
+    def __contains__(self, key):
+        with self._lock:
+            return self._lookup(key) is not self._MISSING
+
+    def add(self, key):
+        self[key] = True
+
+    def add_if_absent(self, key, value=True):
+        """Store key unless it's already live; True if this call stored it"""
+        with self._lock:
+            if self._lookup(key) is not self._MISSING:
+                return False
+            self._store(key, value)
+            return True
+
+    def discard(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        return {
+            'name': self.name,
+            'size': len(self._data),
+            'maxsize': self.maxsize,
+            'ttl': self.ttl,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions
+        }
+
+class PageCache:
+    """Cache of fully rendered public pages.
+
+    Keys combine the page name, a per-page generation token and the request
+    arguments. invalidate() swaps the generation token, which orphans every
+    cached variant of the page at once; orphans expire with their timeout.
+    A hit returns the stored HTML without running the view, so no database
+    work happens. Counters on cached pages are refreshed by the timeout only.
+    """
+    _app = None
+
+    @classmethod
+    def init_app(cls, app):
+        cache.init_app(app)
+        cls._app = app
+
+    @staticmethod
+    def _generation_key(page):
+        return f'page-generation:{page}'
+
+    @classmethod
+    def _generation(cls, page):
+        generation = cache.get(cls._generation_key(page))
+        if generation is None:
+            # Random rather than counted, so an evicted token can never revive old entries
+            cache.add(cls._generation_key(page), secrets.token_hex(4), timeout=0)
+            generation = cache.get(cls._generation_key(page))
+        return generation
+
+    @classmethod
+    def make_key(cls, page, view_args=None):
+        args = sorted((view_args or {}).items()) + sorted(request.args.items(multi=True))
+        return f"page:{page}:{cls._generation(page)}:{urlencode(args)}"
+
+    @classmethod
+    def cached(cls, page, timeout=PAGE_CACHE_TIMEOUT):
+        """Decorator serving a view's 200 responses from the cache for up to timeout seconds"""
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                try:
+                    key = cls.make_key(page, kwargs)
+                    body = cache.get(key)
+                except Exception as e:
+                    logging.error(f"Page cache read failed for {page}: {e}")
+                    return view(*args, **kwargs)
+
+                if body is not None:
+                    response = Response(body, mimetype='text/html')
+                    response.headers['X-Page-Cache'] = 'HIT'
+                    return response
+
+                response = make_response(view(*args, **kwargs))
+                if response.status_code == 200 and not g.pop('page_cache_skip', False):
+                    try:
+                        cache.set(key, response.get_data(), timeout=g.pop('page_cache_timeout', timeout))
+                    except Exception as e:
+                        logging.error(f"Page cache write failed for {page}: {e}")
+                response.headers['X-Page-Cache'] = 'MISS'
+                return response
+            return wrapper
+        return decorator
+
+    @staticmethod
+    def skip():
+        """Don't cache the response being rendered (error and fallback pages)"""
+        g.page_cache_skip = True
+
+    @staticmethod
+    def expire_in(seconds):
+        """Shorten the cache lifetime of the response being rendered"""
+        g.page_cache_timeout = max(1, min(int(seconds), g.get('page_cache_timeout', PAGE_CACHE_TIMEOUT)))
+
+    @classmethod
+    def invalidate(cls, *pages):
+        """Drop every cached variant of the given pages, callable from any thread.
+
+        Writes to the cache backend directly rather than pushing an app context:
+        popping one runs the teardown hooks, which would remove the calling
+        thread's scoped session and detach whatever it just committed.
+        """
+        if not cls._app:
+            return
+        try:
+            backend = cls._app.extensions['cache'][cache]
+            for page in pages:
+                backend.set(cls._generation_key(page), secrets.token_hex(4), timeout=0)
+                logging.info(f"Invalidated page cache for {page}")
+        except Exception as e:
+            logging.error(f"Page cache invalidation failed for {pages}: {e}")
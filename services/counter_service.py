@@ -0,0 +1,126 @@
+# services/counter_service.py
+import atexit
+import logging
+import threading
+from collections import defaultdict
+from sqlalchemy import text
+from models.base import engine
+from config import COUNTER_FLUSH_INTERVAL_MS
+
+class CounterService:
+    """Write-behind buffer for hot counters (podcast/video views and likes).
+
+    Increments are accumulated in memory per (entity, id, counter) and a
+    background thread applies them every COUNTER_FLUSH_INTERVAL_MS as one
+    batched ``UPDATE ... SET counter = counter + delta`` per table/counter,
+    so beacons never do a read-modify-write round trip or hold row locks.
+    """
+    # entity -> (table, counters that may be buffered)
+    ENTITIES = {
+        'podcast': ('podcasts', ('views', 'likes')),
+        'video': ('videos', ('views', 'likes')),
+    }
+
+    flush_interval = COUNTER_FLUSH_INTERVAL_MS / 1000
+
+    _pending = defaultdict(int)
+    _inflight = {}
+    _lock = threading.Lock()
+    _flush_lock = threading.Lock()
+    _start_lock = threading.Lock()
+    _stop_event = threading.Event()
+    _thread = None
+
+    @classmethod
+    def increment(cls, entity, entity_id, counter, delta=1):
+        """Buffer a counter change, it is persisted by the next flush"""
+        cls._validate(entity, counter)
+        with cls._lock:
+            cls._pending[(entity, entity_id, counter)] += delta
+        cls._ensure_flusher()
+
+    @classmethod
+    def pending(cls, entity, entity_id, counter):
+        """Delta not yet visible in the database for this counter"""
+        key = (entity, entity_id, counter)
+        with cls._lock:
+            return cls._pending.get(key, 0) + cls._inflight.get(key, 0)
+
+    @classmethod
+    def get_count(cls, entity, entity_id, counter, stored_value):
+        """Merge unflushed deltas into a value read from the database"""
+        return (stored_value or 0) + cls.pending(entity, entity_id, counter)
+
+    @classmethod
+    def flush(cls):
+        """Apply all buffered deltas, returns the number of counters written"""
+        with cls._flush_lock:
+            with cls._lock:
+                if not cls._pending:
+                    return 0
+                batch, cls._pending = cls._pending, defaultdict(int)
+                cls._inflight = dict(batch)
+
+            grouped = defaultdict(list)
+            for (entity, entity_id, counter), delta in batch.items():
+                if delta:
+                    grouped[(entity, counter)].append((entity_id, delta))
+
+            try:
+                with engine.begin() as connection:
+                    for (entity, counter), rows in grouped.items():
+                        table = cls.ENTITIES[entity][0]
+                        params = {}
+                        for i, (entity_id, delta) in enumerate(rows):
+                            params[f'id_{i}'] = entity_id
+                            params[f'delta_{i}'] = delta
+                        cases = ' '.join(f"WHEN :id_{i} THEN :delta_{i}" for i in range(len(rows)))
+                        ids = ', '.join(f":id_{i}" for i in range(len(rows)))
+                        connection.execute(text(
+                            f"UPDATE {table} "
+                            f"SET {counter} = COALESCE({counter}, 0) + CASE id {cases} ELSE 0 END "
+                            f"WHERE id IN ({ids})"
+                        ), params)
+                return len(batch)
+            except Exception as e:
+                logging.error(f"Counter flush failed, requeueing {len(batch)} deltas: {e}")
+                with cls._lock:
+                    for key, delta in batch.items():
+                        cls._pending[key] += delta
+                return 0
+            finally:
+                with cls._lock:
+                    cls._inflight = {}
+
+    @classmethod
+    def stop(cls):
+        """Stop the flusher and persist whatever is still buffered"""
+        cls._stop_event.set()
+        cls.flush()
+
+    @classmethod
+    def _validate(cls, entity, counter):
+        if entity not in cls.ENTITIES or counter not in cls.ENTITIES[entity][1]:
+            raise ValueError(f"Unknown counter {entity}.{counter}")
+
+    @classmethod
+    def _ensure_flusher(cls):
+        # Started lazily so every forked worker gets its own flusher thread
+        if cls._thread and cls._thread.is_alive():
+            return
+        with cls._start_lock:
+            if cls._thread and cls._thread.is_alive():
+                return
+            cls._stop_event.clear()
+            cls._thread = threading.Thread(target=cls._run, name='counter-flusher', daemon=True)
+            cls._thread.start()
+
+    @classmethod
+    def _run(cls):
+        while not cls._stop_event.wait(cls.flush_interval):
+            try:
+                cls.flush()
+            except Exception as e:
+                logging.error(f"Counter flusher error: {e}")
+
+atexit.register(CounterService.stop)
@@ -0,0 +1,109 @@
+# services/direct_upload_service.py
+import logging
+import secrets
+import time
+import cloudinary
+import cloudinary.api
+import cloudinary.uploader
+import cloudinary.utils
+from itsdangerous import URLSafeTimedSerializer, BadSignature, SignatureExpired
+from config import DIRECT_UPLOAD_CHUNK_SIZE, DIRECT_UPLOAD_TOKEN_MAX_AGE
+
+class DirectUploadService:
+    """Signed uploads that go straight from the browser to Cloudinary.
+
+    sign() picks the public_id and signs every upload parameter, so the browser
+    can't change where or how the file is stored. complete() checks Cloudinary's
+    response signature plus our own timed token, then reads the asset back from
+    the Admin API so URLs and durations never come from the client.
+    """
+    # kind -> resource type and the upload parameters covered by the signature
+    PRESETS = {
+        'podcast': ('video', {
+            'folder': 'podcasts',
+            'allowed_formats': 'mp3,wav,m4a'
+        }),
+        'video': ('video', {
+            'folder': 'videos',
+            'eager': cloudinary.utils.build_eager([
+                {'quality': 'auto', 'format': 'mp4'},
+                {'width': 720, 'crop': 'scale', 'quality': 'auto'}
+            ]),
+            'eager_async': 'true'
+        }),
+        'thumbnail': ('image', {
+            'folder': 'video_thumbnails',
+            'allowed_formats': 'jpg,jpeg,png,gif,webp',
+            'transformation': 'c_fill,w_720/q_auto'
+        })
+    }
+
+    @staticmethod
+    def _serializer():
+        # Keyed on the Cloudinary secret, app.secret_key differs between gunicorn workers
+        return URLSafeTimedSerializer(cloudinary.config().api_secret, salt='direct-upload')
+
+    @classmethod
+    def sign(cls, kind):
+        """Signed parameters for one browser upload of the given kind"""
+        if kind not in cls.PRESETS:
+            raise ValueError(f'Invalid upload kind: {kind}')
+        config = cloudinary.config()
+        if not (config.cloud_name and config.api_key and config.api_secret):
+            raise RuntimeError('Cloudinary is not configured')
+
+        resource_type, preset = cls.PRESETS[kind]
+        params = dict(preset)
+        params['public_id'] = f"{params.pop('folder')}/{secrets.token_hex(10)}"
+        params['timestamp'] = int(time.time())
+
+        return {
+            'upload_url': f"https://api.cloudinary.com/v1_1/{config.cloud_name}/{resource_type}/upload",
+            'params': dict(
+                params,
+                api_key=config.api_key,
+                signature=cloudinary.utils.api_sign_request(params, config.api_secret)
+            ),
+            'chunk_size': DIRECT_UPLOAD_CHUNK_SIZE,
+            'token': cls._serializer().dumps({'kind': kind, 'public_id': params['public_id']})
+        }
+
+    @classmethod
+    def complete(cls, kind, upload):
+        """Verify a browser upload result and return the asset as stored by Cloudinary.
+
+        upload holds the token from sign() and public_id, version and signature
+        from Cloudinary's upload response. Raises ValueError when any of them
+        don't check out.
+        """
+        try:
+            issued = cls._serializer().loads(upload.get('token', ''), max_age=DIRECT_UPLOAD_TOKEN_MAX_AGE)
+        except SignatureExpired:
+            raise ValueError('Upload token expired')
+        except BadSignature:
+            raise ValueError('Invalid upload token')
+
+        public_id = upload.get('public_id')
+        if issued['kind'] != kind or issued['public_id'] != public_id:
+            raise ValueError('Upload does not match its token')
+        if not cloudinary.utils.verify_api_response_signature(
+                public_id, upload.get('version'), upload.get('signature')):
+            raise ValueError('Invalid Cloudinary response signature')
+
+        resource_type = cls.PRESETS[kind][0]
+        resource = cloudinary.api.resource(public_id, resource_type=resource_type)
+        logging.info(f"Verified direct {kind} upload {public_id}")
+        return {
+            'public_id': resource['public_id'],
+            'secure_url': resource['secure_url'],
+            'duration': resource.get('duration', 0),
+            'bytes': resource.get('bytes', 0)
+        }
+
+    @classmethod
+    def discard(cls, kind, public_id):
+        """Remove an uploaded asset that was rejected after upload"""
+        try:
+            cloudinary.uploader.destroy(public_id, resource_type=cls.PRESETS[kind][0], invalidate=True)
+        except Exception as e:
+            logging.error(f"Error discarding direct upload {public_id}: {e}")
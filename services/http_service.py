@@ -0,0 +1,96 @@
+# services/http_service.py
+import logging
+import threading
+from contextlib import contextmanager
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from config import HTTP_PROFILES
+from services.breaker_service import CircuitBreaker
+
+class ResponseTooLarge(requests.exceptions.RequestException):
+    """Response body exceeded the dependency's max_bytes"""
+
+class HttpClient:
+    """Shared outbound HTTP, one pooled keep-alive session and circuit breaker per dependency.
+
+    Each profile in HTTP_PROFILES sets the (connect, read) timeouts, how many
+    times idempotent requests are retried with jittered backoff, how many
+    hosts and connections per host are pooled, and the largest body accepted.
+    """
+    _sessions = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def session(cls, dependency):
+        session = cls._sessions.get(dependency)
+        if session is not None:
+            return session
+
+        with cls._lock:
+            if dependency not in cls._sessions:
+                profile = HTTP_PROFILES[dependency]
+                retry = Retry(
+                    total=profile['retries'],
+                    backoff_factor=0.5,
+                    backoff_jitter=0.5,
+                    status_forcelist=(429, 500, 502, 503, 504),
+                    allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,  # Idempotent methods only
+                    respect_retry_after_header=True,
+                    raise_on_status=False
+                )
+                adapter = HTTPAdapter(
+                    pool_connections=profile['hosts'],
+                    pool_maxsize=profile['connections'],
+                    max_retries=retry
+                )
+                session = requests.Session()
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                cls._sessions[dependency] = session
+            return cls._sessions[dependency]
+
+    @staticmethod
+    def timeout(dependency):
+        profile = HTTP_PROFILES[dependency]
+        return (profile['connect'], profile['read'])
+
+    @classmethod
+    @contextmanager
+    def stream(cls, dependency, url, method='GET', **kwargs):
+        """Streamed response for callers reading the body themselves.
+
+        The call holds a slot in the dependency's breaker until the block exits,
+        and 429/5xx responses or errors inside the block count as failures.
+        """
+        kwargs.setdefault('timeout', cls.timeout(dependency))
+        with CircuitBreaker.get(dependency).guard(ignore=(ResponseTooLarge,)) as call:
+            with cls.session(dependency).request(method, url, stream=True, **kwargs) as response:
+                call.failed = response.status_code == 429 or response.status_code >= 500
+                yield response
+
+    @classmethod
+    def get(cls, dependency, url, **kwargs):
+        """GET with the whole body read, raising ResponseTooLarge past the profile's max_bytes"""
+        return cls.request(dependency, 'GET', url, **kwargs)
+
+    @classmethod
+    def request(cls, dependency, method, url, **kwargs):
+        max_bytes = HTTP_PROFILES[dependency]['max_bytes']
+        with cls.stream(dependency, url, method=method, **kwargs) as response:
+            try:
+                declared = response.headers.get('Content-Length')
+                if max_bytes and declared and declared.isdigit() and int(declared) > max_bytes:
+                    raise ResponseTooLarge(f"{url} declares {declared} bytes, limit is {max_bytes}")
+
+                body = bytearray()
+                for chunk in response.iter_content(chunk_size=64 * 1024):
+                    body.extend(chunk)
+                    if max_bytes and len(body) > max_bytes:
+                        raise ResponseTooLarge(f"{url} exceeded {max_bytes} bytes")
+            except ResponseTooLarge as e:
+                logging.warning(f"{dependency}: {e}")
+                raise
+            # Leaving the block hands the connection back to the pool
+            response._content = bytes(body)
+        return response
@@ -0,0 +1,174 @@
+# services/image_cache_service.py
+import logging
+import os
+import sqlite3
+import threading
+import time
+from config import IMAGE_CACHE_DIR, IMAGE_CACHE_MAX_BYTES, IMAGE_CACHE_MANIFEST
+
+class ImageCache:
+    """Byte-bounded LRU over the generated images directory.
+
+    A SQLite manifest shared by every worker on the container tracks
+    (key, size, last access, pinned) with a running byte total, so writes
+    evict the least recently used unpinned files through an index, touching
+    only the rows they remove. Images referenced by the live news snapshot
+    are pinned and never evicted.
+    """
+    _conn = None
+    _pid = None
+    _lock = threading.Lock()
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS entries (
+            key TEXT PRIMARY KEY,
+            size INTEGER NOT NULL,
+            last_access REAL NOT NULL,
+            pinned INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE INDEX IF NOT EXISTS entries_lru ON entries (pinned, last_access);
+        CREATE TABLE IF NOT EXISTS totals (id INTEGER PRIMARY KEY CHECK (id = 1), bytes INTEGER NOT NULL);
+    """
+
+    @classmethod
+    def _connection(cls):
+        # Connections don't survive a fork, reopen in each worker
+        if cls._conn is None or cls._pid != os.getpid():
+            os.makedirs(os.path.dirname(IMAGE_CACHE_MANIFEST) or '.', exist_ok=True)
+            conn = sqlite3.connect(IMAGE_CACHE_MANIFEST, timeout=10, isolation_level=None,
+                                   check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(cls.SCHEMA)
+            cls._conn, cls._pid = conn, os.getpid()
+            cls._adopt_existing(conn)
+        return cls._conn
+
+    @classmethod
+    def _adopt_existing(cls, conn):
+        """Index files already on disk the first time a manifest is created"""
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if conn.execute("SELECT 1 FROM totals").fetchone():
+                conn.execute("COMMIT")
+                return
+
+            total = 0
+            if os.path.isdir(IMAGE_CACHE_DIR):
+                for entry in os.scandir(IMAGE_CACHE_DIR):
+                    if entry.is_file() and not entry.name.endswith('.tmp'):
+                        stat = entry.stat()
+                        conn.execute("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, 0)",
+                                     (entry.name, stat.st_size, stat.st_mtime))
+                        total += stat.st_size
+            conn.execute("INSERT INTO totals VALUES (1, ?)", (total,))
+            conn.execute("COMMIT")
+            logging.info(f"Image cache manifest created, {total} bytes already on disk")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    @staticmethod
+    def key(path):
+        return os.path.basename(path)
+
+    @classmethod
+    def put(cls, path, size=None):
+        """Record a file just written to the cache directory, then evict down to the budget"""
+        size = os.path.getsize(path) if size is None else size
+        with cls._lock:
+            conn = cls._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                previous = conn.execute("SELECT size FROM entries WHERE key = ?", (cls.key(path),)).fetchone()
+                conn.execute(
+                    "INSERT INTO entries (key, size, last_access) VALUES (?, ?, ?) "
+                    "ON CONFLICT (key) DO UPDATE SET size = excluded.size, last_access = excluded.last_access",
+                    (cls.key(path), size, time.time())
+                )
+                conn.execute("UPDATE totals SET bytes = bytes + ?", (size - (previous[0] if previous else 0),))
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return cls.evict()
+
+    @classmethod
+    def touch(cls, path):
+        """Mark a cache hit"""
+        with cls._lock:
+            cls._connection().execute("UPDATE entries SET last_access = ? WHERE key = ?",
+                                      (time.time(), cls.key(path)))
+
+    @classmethod
+    def pin_only(cls, paths):
+        """Pin exactly these images, releasing whatever was pinned before"""
+        keys = [cls.key(path) for path in paths if path]
+        placeholders = ','.join('?' * len(keys))
+        with cls._lock:
+            conn = cls._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute(f"UPDATE entries SET pinned = 0 WHERE pinned = 1 AND key NOT IN ({placeholders})", keys)
+                if keys:
+                    conn.execute(f"UPDATE entries SET pinned = 1 WHERE key IN ({placeholders})", keys)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    @classmethod
+    def existing(cls, paths):
+        """The subset of paths (or URLs) whose images are in the cache, one indexed lookup"""
+        by_key = {cls.key(path): path for path in paths if path}
+        if not by_key:
+            return set()
+        placeholders = ','.join('?' * len(by_key))
+        with cls._lock:
+            rows = cls._connection().execute(
+                f"SELECT key FROM entries WHERE key IN ({placeholders})", list(by_key)
+            ).fetchall()
+        return {by_key[key] for key, in rows}
+
+    @classmethod
+    def evict(cls, max_bytes=IMAGE_CACHE_MAX_BYTES):
+        """Remove least recently used unpinned images until the cache fits max_bytes"""
+        evicted = []
+        with cls._lock:
+            conn = cls._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                total = conn.execute("SELECT bytes FROM totals").fetchone()[0]
+                if total > max_bytes:
+                    rows = conn.execute(
+                        "SELECT key, size FROM entries WHERE pinned = 0 ORDER BY last_access"
+                    )
+                    for key, size in rows:
+                        evicted.append((key, size))
+                        total -= size
+                        if total <= max_bytes:
+                            break
+                    conn.executemany("DELETE FROM entries WHERE key = ?", [(key,) for key, _ in evicted])
+                    conn.execute("UPDATE totals SET bytes = ?", (total,))
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+        for key, _ in evicted:
+            try:
+                os.remove(os.path.join(IMAGE_CACHE_DIR, key))
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logging.error(f"Error evicting cached image {key}: {e}")
+        if evicted:
+            logging.info(f"Evicted {len(evicted)} cached images ({sum(size for _, size in evicted)} bytes)")
+        return len(evicted)
+
+    @classmethod
+    def stats(cls):
+        with cls._lock:
+            conn = cls._connection()
+            total = conn.execute("SELECT bytes FROM totals").fetchone()[0]
+            count, pinned = conn.execute("SELECT COUNT(*), COALESCE(SUM(pinned), 0) FROM entries").fetchone()
+        return {'bytes': total, 'max_bytes': IMAGE_CACHE_MAX_BYTES, 'files': count, 'pinned': pinned}
@@ -1,12 +1,26 @@
 from PIL import Image, ImageDraw, ImageFont  # Add ImageDraw and ImageFont
+import codecs
 import os
-import requests
-from bs4 import BeautifulSoup
-from config import UNSPLASH_ACCESS_KEY
+import queue
+from html.parser import HTMLParser
+from config import (
+    UNSPLASH_ACCESS_KEY,
+    ARTICLE_HEAD_BYTES,
+    ARTICLE_SCAN_BYTES,
+    IMAGE_CACHE_TIME,
+    IMAGE_INDEX_MAX,
+    USED_IMAGES_MAX,
+    USED_IMAGES_TTL,
+    IMAGE_REGEN_QUEUE_SIZE
+)
+from services.cache_service import PageCache, TTLCache
+from services.http_service import HttpClient
+from services.image_cache_service import ImageCache
 import hashlib
 import tweepy
 from io import BytesIO
 import time
+import threading
 import logging
 from datetime import datetime
 
@@ -17,10 +31,63 @@ logging.basicConfig(
     datefmt='%Y-%m-%d %H:%M:%S'
 )
 
+class ArticleImageParser(HTMLParser):
+    """Incremental parser collecting image candidates from <meta> tags and the first <article> <img>"""
+    # Meta tags in order of preference
+    META_IMAGES = [
+        ('property', 'og:image'),
+        ('name', 'twitter:image'),
+        ('property', 'og:image:secure_url'),
+        ('itemprop', 'image')
+    ]
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.meta_images = {}
+        self.head_closed = False
+        self.article_depth = 0
+        self.article_image = None
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == 'meta':
+            if attrs.get('content'):
+                for rank, (attr, value) in enumerate(self.META_IMAGES):
+                    if attrs.get(attr) == value:
+                        self.meta_images.setdefault(rank, attrs['content'])
+        elif tag == 'body':
+            self.head_closed = True
+        elif tag == 'article':
+            self.article_depth += 1
+        elif tag == 'img' and self.article_depth and not self.article_image and attrs.get('src'):
+            self.article_image = attrs['src']
+
+    def handle_endtag(self, tag):
+        if tag == 'head':
+            self.head_closed = True
+        elif tag == 'article' and self.article_depth:
+            self.article_depth -= 1
+
+    @property
+    def has_best_image(self):
+        return 0 in self.meta_images
+
+    @property
+    def meta_image(self):
+        return self.meta_images[min(self.meta_images)] if self.meta_images else None
+
 class ImageService:
-    used_images = set()
-    image_cache = {}
-    cache_timeout = 3600  # 1 hour cache
+    cache_timeout = IMAGE_CACHE_TIME
+    used_images = TTLCache('used_images', maxsize=USED_IMAGES_MAX, ttl=USED_IMAGES_TTL)
+    image_cache = TTLCache('image_cache', maxsize=IMAGE_INDEX_MAX, ttl=cache_timeout)
+    DEFAULT_NEWS_IMAGE = '/static/images/default-news.jpg'
+
+    # Missing article images, regenerated off the request path
+    _regen_queue = queue.Queue(maxsize=IMAGE_REGEN_QUEUE_SIZE)
+    _regen_pending = set()
+    _regen_lock = threading.Lock()
+    _regen_thread = None
+    scan_chunk_size = 16 * 1024  # Bytes of article HTML parsed per read
 
     @staticmethod
     def compress_image(image_data, max_size=(800, 800), quality=85):
@@ -51,79 +118,117 @@ class ImageService:
         """Generate hash for image URL"""
         return hashlib.md5(url.encode()).hexdigest()
 
+    @staticmethod
+    def download_image(url):
+        """Download raw image bytes, None if the host doesn't return them"""
+        try:
+            headers = {
+                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+            }
+            response = HttpClient.get('images', url, headers=headers)
+            if response.status_code == 200 and response.content:
+                return response.content
+            return None
+        except Exception as e:
+            print(f"Error downloading image from {url}: {e}")
+            return None
+
+    @classmethod
+    def save_image(cls, image_data, save_path, url=None):
+        """Compress downloaded image bytes to save_path"""
+        try:
+            compressed_data = cls.compress_image(image_data)
+            if not compressed_data:
+                return None
+
+            # Ensure directory exists
+            os.makedirs(os.path.dirname(save_path), exist_ok=True)
+
+            # Write then rename so concurrent readers never see a partial file
+            temp_path = f"{save_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temp_path, 'wb') as f:
+                f.write(compressed_data)
+            os.replace(temp_path, save_path)
+            cls._track(save_path, len(compressed_data))
+
+            if url:
+                cls.image_cache[cls.get_image_hash(url)] = {
+                    'path': save_path,
+                    'timestamp': time.time()
+                }
+            return save_path
+        except Exception as e:
+            print(f"Error saving image to {save_path}: {e}")
+            return None
+
+    @staticmethod
+    def _track(path, size=None):
+        """Record a write (size given) or a hit in the LRU manifest; the image itself is fine either way"""
+        try:
+            if size is None:
+                ImageCache.touch(path)
+            else:
+                ImageCache.put(path, size)
+        except Exception as e:
+            logging.error(f"Image cache manifest error for {path}: {e}")
+
     @classmethod
     def get_cached_image(cls, url, save_path):
         """Get image from cache or download with better error handling"""
         try:
-            image_hash = cls.get_image_hash(url)
-            current_time = time.time()
-            
             # Check filesystem cache first
             if os.path.exists(save_path):
+                cls._track(save_path)
                 # Update cache metadata
-                cls.image_cache[image_hash] = {
+                cls.image_cache[cls.get_image_hash(url)] = {
                     'path': save_path,
-                    'timestamp': current_time
+                    'timestamp': time.time()
                 }
                 return save_path
 
-            # Try to download image
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            response = requests.get(url, headers=headers, timeout=10)
-            if response.status_code == 200:
-                # Ensure directory exists
-                os.makedirs(os.path.dirname(save_path), exist_ok=True)
-                
-                # Compress and save image
-                compressed_data = cls.compress_image(response.content)
-                if compressed_data:
-                    with open(save_path, 'wb') as f:
-                        f.write(compressed_data)
-                    
-                    # Update cache
-                    cls.image_cache[image_hash] = {
-                        'path': save_path,
-                        'timestamp': current_time
-                    }
-                    return save_path
+            image_data = cls.download_image(url)
+            if image_data:
+                return cls.save_image(image_data, save_path, url)
 
             return None
         except Exception as e:
             print(f"Error caching image from {url}: {e}")
             return None
 
-    @staticmethod
-    def get_article_image(url):
-        """Extract image from article URL"""
+    @classmethod
+    def get_article_image(cls, url):
+        """Extract image from article URL, streaming only as much HTML as it takes.
+
+        Stops as soon as og:image shows up, at </head> once any meta image is
+        known, and otherwise scans on for the first <article> <img> within
+        ARTICLE_SCAN_BYTES.
+        """
         try:
             headers = {
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
             }
-            response = requests.get(url, headers=headers, timeout=5)
-            if response.status_code == 200:
-                soup = BeautifulSoup(response.text, 'html.parser')
-                
-                # Try different meta tags for images
-                for meta in [
-                    ('property', 'og:image'),
-                    ('name', 'twitter:image'),
-                    ('property', 'og:image:secure_url'),
-                    ('itemprop', 'image')
-                ]:
-                    image_tag = soup.find('meta', {meta[0]: meta[1]})
-                    if image_tag and image_tag.get('content'):
-                        return image_tag.get('content')
-                
-                # Try finding first article image
-                article_img = soup.find('article')
-                if article_img:
-                    img = article_img.find('img')
-                    if img and img.get('src'):
-                        return img.get('src')
-                        
-            return None
+            with HttpClient.stream('articles', url, headers=headers) as response:
+                content_type = response.headers.get('Content-Type', 'text/html')
+                if response.status_code != 200 or 'html' not in content_type:
+                    return None
+
+                # requests falls back to latin-1 for text/* without a charset, pages are mostly utf-8
+                encoding = response.encoding if 'charset' in content_type.lower() else 'utf-8'
+                decoder = codecs.getincrementaldecoder(encoding or 'utf-8')(errors='replace')
+                parser = ArticleImageParser()
+                received = 0
+                for chunk in response.iter_content(chunk_size=cls.scan_chunk_size):
+                    received += len(chunk)
+                    parser.feed(decoder.decode(chunk))
+                    if parser.has_best_image:
+                        break
+                    if parser.head_closed or received >= ARTICLE_HEAD_BYTES:
+                        if parser.meta_image or parser.article_image:
+                            break
+                        if received >= ARTICLE_SCAN_BYTES:
+                            break
+
+                return parser.meta_image or parser.article_image
         except Exception as e:
             print(f"Error extracting article image: {e}")
             return None
@@ -149,75 +254,122 @@ class ImageService:
                         return cached_image
 
             # Fallback to Unsplash with cached results
-            keywords = [word.lower() for word in title.split() 
-                       if len(word) > 3 and word.lower() not in 
-                       {'the', 'and', 'for', 'that', 'with', 'this', 'from'}][:3]
-            
-            if not keywords:
-                keywords = ['news']
-
-            search_query = f"{' '.join(keywords)} news"
-            params = {
-                "query": search_query,
-                "orientation": "landscape",
-                "per_page": 5
-            }
-            
-            headers = {"Authorization": f"Client-ID {UNSPLASH_ACCESS_KEY}"}
-            
-            response = requests.get(
-                "https://api.unsplash.com/search/photos",
-                headers=headers,
-                params=params
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                if data['results']:
-                    # Try each result until we get a valid image
-                    for result in data['results']:
-                        image_url = result['urls']['regular']
-                        if image_url not in cls.used_images:
-                            cached_image = cls.get_cached_image(image_url, image_path)
-                            if cached_image:
-                                cls.used_images.add(image_url)
-                                return cached_image
+            for image_url in cls.search_unsplash(title):
+                cached_image = cls.get_cached_image(image_url, image_path)
+                if cached_image:
+                    cls.used_images.add(image_url)
+                    return cached_image
 
             return None
         except Exception as e:
             print(f"Error generating image for {title}: {e}")
             return None
 
+    @classmethod
+    def search_unsplash(cls, title):
+        """Unsplash image URLs matching the title keywords, skipping ones already used"""
+        keywords = [word.lower() for word in title.split() 
+                   if len(word) > 3 and word.lower() not in 
+                   {'the', 'and', 'for', 'that', 'with', 'this', 'from'}][:3]
+        
+        if not keywords:
+            keywords = ['news']
+
+        params = {
+            "query": f"{' '.join(keywords)} news",
+            "orientation": "landscape",
+            "per_page": 5
+        }
+        
+        headers = {"Authorization": f"Client-ID {UNSPLASH_ACCESS_KEY}"}
+        
+        try:
+            response = HttpClient.get(
+                'unsplash',
+                "https://api.unsplash.com/search/photos",
+                headers=headers,
+                params=params
+            )
+            if response.status_code != 200:
+                return []
+            return [
+                result['urls']['regular']
+                for result in response.json().get('results', [])
+                if result['urls']['regular'] not in cls.used_images
+            ]
+        except Exception as e:
+            print(f"Error searching Unsplash for {title}: {e}")
+            return []
+
     @staticmethod
     def clear_used_images():
         """Clear the used images cache"""
         ImageService.used_images.clear()
 
-    @staticmethod
-    def preload_images(articles):
-        """Preload all article images"""
+    @classmethod
+    def preload_images(cls, articles):
+        """Image URLs of article dicts that are on disk, per the cache manifest.
+
+        Never downloads anything: missing images are left out and queued for
+        background regeneration, which refreshes the news page once they exist.
+        """
         try:
-            preloaded = []
+            urls = [article['image_url'] for article in articles if article.get('image_url')]
+            present = ImageCache.existing(urls)
             for article in articles:
-                if article.image_url:
-                    img_path = article.image_url.lstrip('/')
-                    if os.path.exists(img_path):
-                        preloaded.append(article.image_url)
-                    else:
-                        # Try to generate/cache image
-                        final_path = ImageService.generate_news_image(
-                            article.title,
-                            article.url,
-                            img_path
-                        )
-                        if final_path:
-                            preloaded.append(f"/{final_path}")
-                            
-            return preloaded
+                if article.get('image_url') and article['image_url'] not in present:
+                    cls.queue_regeneration(article['title'], article['url'], article['image_url'].lstrip('/'))
+            return [url for url in urls if url in present]
         except Exception as e:
             logging.error(f"Error preloading images: {e}")
             return []
 
+    @classmethod
+    def queue_regeneration(cls, title, news_url, image_path):
+        """Queue an image for background generation, once per path however often it's asked for"""
+        with cls._regen_lock:
+            if image_path in cls._regen_pending:
+                return False
+            try:
+                cls._regen_queue.put_nowait((title, news_url, image_path))
+            except queue.Full:
+                logging.warning(f"Image regeneration queue full, skipping {image_path}")
+                return False
+            cls._regen_pending.add(image_path)
+        cls._ensure_regenerator()
+        return True
+
+    @classmethod
+    def _ensure_regenerator(cls):
+        # Started lazily so every forked worker gets its own regeneration thread
+        if cls._regen_thread and cls._regen_thread.is_alive():
+            return
+        with cls._regen_lock:
+            if cls._regen_thread and cls._regen_thread.is_alive():
+                return
+            cls._regen_thread = threading.Thread(target=cls._regenerate, name='image-regenerator', daemon=True)
+            cls._regen_thread.start()
+
+    @classmethod
+    def _regenerate(cls):
+        regenerated = 0
+        while True:
+            title, news_url, image_path = cls._regen_queue.get()
+            try:
+                if cls.generate_news_image(title, news_url, image_path):
+                    regenerated += 1
+            except Exception as e:
+                logging.error(f"Error regenerating image {image_path}: {e}")
+            finally:
+                with cls._regen_lock:
+                    cls._regen_pending.discard(image_path)
+
+            # One invalidation per drained batch, not per image
+            if regenerated and cls._regen_queue.empty():
+                logging.info(f"Regenerated {regenerated} news images")
+                PageCache.invalidate('news')
+                regenerated = 0
+
     @staticmethod
     def add_watermark(image_path, text="www.onposter.site/news | www.onposter.site"):
         """Add text watermark to image"""
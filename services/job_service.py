@@ -0,0 +1,141 @@
+# services/job_service.py
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from models.base import db_session
+from models.upload_job import UploadJob
+from services.upload_service import UploadService
+from config import UPLOAD_WORKERS, JOB_HEARTBEAT_INTERVAL, JOB_STALE_SECONDS
+
+class JobService:
+    """Background worker pool for slow upload processing.
+
+    Request handlers only spool the body to disk and call submit(), which
+    records a queued UploadJob row and returns immediately. Job state lives in
+    the database so any gunicorn worker can answer /api/jobs/<id>.
+
+    Jobs run in the worker that queued them, which bumps their updated_at every
+    JOB_HEARTBEAT_INTERVAL. When a worker is recycled or crashes its jobs stop
+    beating, and reap_stale() fails them and removes their spooled files.
+    """
+    ACTIVE = ('queued', 'running')
+
+    _executor = ThreadPoolExecutor(max_workers=UPLOAD_WORKERS, thread_name_prefix='upload-job')
+    _active = set()
+    _lock = threading.Lock()
+    _heartbeat_thread = None
+
+    @classmethod
+    def submit(cls, kind, func, *args, files=(), **kwargs):
+        """Queue func(job_id, *args, **kwargs) and return the new job id.
+
+        func returns the job result (JSON-serializable) and may call
+        JobService.update() to report progress. files are the spooled paths
+        the job owns, discarded if the job is reaped.
+        """
+        job = UploadJob(kind=kind, status='queued', stage='Queued', progress=0,
+                        files=[path for path in files if path])
+        db_session.add(job)
+        db_session.commit()
+        job_id = job.id
+        with cls._lock:
+            cls._active.add(job_id)
+        cls._ensure_heartbeat()
+        cls._executor.submit(cls._execute, job_id, func, args, kwargs)
+        logging.info(f"Queued {kind} job {job_id}")
+        return job_id
+
+    @classmethod
+    def get(cls, job_id):
+        return UploadJob.query.get(job_id)
+
+    @classmethod
+    def update(cls, job_id, **fields):
+        """Persist status/stage/progress/result/error changes for a job"""
+        try:
+            job = UploadJob.query.get(job_id)
+            if not job:
+                return
+            for name, value in fields.items():
+                setattr(job, name, value)
+            db_session.commit()
+        except Exception as e:
+            db_session.rollback()
+            logging.error(f"Error updating job {job_id}: {e}")
+
+    @classmethod
+    def reap_stale(cls, max_age=JOB_STALE_SECONDS):
+        """Fail queued/running jobs whose worker stopped beating and remove their files"""
+        cutoff = datetime.utcnow() - timedelta(seconds=max_age)
+        try:
+            stale = UploadJob.query.filter(
+                UploadJob.status.in_(cls.ACTIVE),
+                UploadJob.updated_at < cutoff
+            ).all()
+            files = []
+            for job in stale:
+                job.status = 'failed'
+                job.stage = 'Failed'
+                job.error = 'Interrupted, the worker processing this upload stopped. Please upload again.'
+                files.extend(job.files or [])
+                job.files = None
+            db_session.commit()
+        except Exception as e:
+            db_session.rollback()
+            logging.error(f"Error reaping stale jobs: {e}")
+            return 0
+
+        UploadService.discard(*files)
+        if stale:
+            logging.warning(f"Reaped {len(stale)} stale upload jobs, removed {len(files)} spooled files")
+        return len(stale)
+
+    @classmethod
+    def _ensure_heartbeat(cls):
+        # Started lazily so every forked worker beats for its own jobs
+        if cls._heartbeat_thread and cls._heartbeat_thread.is_alive():
+            return
+        with cls._lock:
+            if cls._heartbeat_thread and cls._heartbeat_thread.is_alive():
+                return
+            cls._heartbeat_thread = threading.Thread(target=cls._heartbeat, name='upload-job-heartbeat', daemon=True)
+            cls._heartbeat_thread.start()
+
+    @classmethod
+    def _heartbeat(cls):
+        while True:
+            time.sleep(JOB_HEARTBEAT_INTERVAL)
+            with cls._lock:
+                job_ids = list(cls._active)
+            if not job_ids:
+                continue
+            try:
+                UploadJob.query.filter(
+                    UploadJob.id.in_(job_ids),
+                    UploadJob.status.in_(cls.ACTIVE)
+                ).update({UploadJob.updated_at: datetime.utcnow()}, synchronize_session=False)
+                db_session.commit()
+            except Exception as e:
+                db_session.rollback()
+                logging.error(f"Error recording upload job heartbeat: {e}")
+            finally:
+                db_session.remove()
+
+    @classmethod
+    def _execute(cls, job_id, func, args, kwargs):
+        try:
+            cls.update(job_id, status='running', stage='Processing', progress=5)
+            result = func(job_id, *args, **kwargs)
+            cls.update(job_id, status='done', stage='Complete', progress=100, result=result, files=None)
+            logging.info(f"Job {job_id} completed")
+        except Exception as e:
+            db_session.rollback()
+            logging.error(f"Job {job_id} failed: {e}")
+            cls.update(job_id, status='failed', stage='Failed', error=str(e), files=None)
+        finally:
+            with cls._lock:
+                cls._active.discard(job_id)
+            # Worker threads outlive requests, release their scoped session
+            db_session.remove()
@@ -0,0 +1,166 @@
+# services/leader_service.py
+import atexit
+import logging
+import os
+import threading
+from datetime import datetime
+from sqlalchemy import text
+from models.base import engine
+from config import SCHEDULER_LEADER_LOCK_ID, LEADER_HEARTBEAT_INTERVAL, LEADER_RETRY_INTERVAL
+
+class LeaderElection:
+    """Elects one process across all workers and replicas to run scheduled jobs.
+
+    The leader holds a session-level Postgres advisory lock on a dedicated
+    connection. If the process dies or its connection drops, Postgres releases
+    the lock and the next follower to retry takes over. The leader heartbeats
+    by checking pg_locks, and steps down as soon as it no longer holds the lock.
+    """
+    _instance = None
+
+    @classmethod
+    def get_instance(cls):
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self, lock_id=SCHEDULER_LEADER_LOCK_ID):
+        self.lock_id = lock_id
+        self.is_leader = False
+        self.leader_since = None
+        self.last_heartbeat = None
+        self.thread = None
+        self._connection = None
+        self._elected_callbacks = []
+        self._demoted_callbacks = []
+        self._stop_event = threading.Event()
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+
+    def on_elected(self, callback):
+        if callback not in self._elected_callbacks:
+            self._elected_callbacks.append(callback)
+
+    def on_demoted(self, callback):
+        if callback not in self._demoted_callbacks:
+            self._demoted_callbacks.append(callback)
+
+    @property
+    def _uses_advisory_locks(self):
+        return engine.dialect.name == 'postgresql'
+
+    def _try_acquire(self):
+        if not self._uses_advisory_locks:
+            # Single-process development databases, nothing to compete with
+            return True
+        connection = engine.connect().execution_options(isolation_level='AUTOCOMMIT')
+        try:
+            acquired = connection.execute(
+                text("SELECT pg_try_advisory_lock(:lock_id)"), {'lock_id': self.lock_id}
+            ).scalar()
+        except Exception:
+            connection.close()
+            raise
+        if acquired:
+            self._connection = connection
+        else:
+            connection.close()
+        return bool(acquired)
+
+    def _still_leader(self):
+        if not self._uses_advisory_locks:
+            return True
+        # A bigint advisory key below 2^32 is stored as classid 0 / objid key / objsubid 1
+        return bool(self._connection.execute(text(
+            "SELECT EXISTS (SELECT 1 FROM pg_locks "
+            "WHERE locktype = 'advisory' AND classid = 0 AND objid = :lock_id "
+            "AND objsubid = 1 AND granted AND pid = pg_backend_pid())"
+        ), {'lock_id': self.lock_id}).scalar())
+
+    def leader_alive(self):
+        """True when some process currently holds the leader lock"""
+        if self.is_leader or not self._uses_advisory_locks:
+            return self.is_leader
+        try:
+            with engine.connect() as connection:
+                return bool(connection.execute(text(
+                    "SELECT EXISTS (SELECT 1 FROM pg_locks "
+                    "WHERE locktype = 'advisory' AND classid = 0 AND objid = :lock_id "
+                    "AND objsubid = 1 AND granted)"
+                ), {'lock_id': self.lock_id}).scalar())
+        except Exception as e:
+            self.logger.error(f"Error checking scheduler leader: {e}")
+            return False
+
+    def _run_callbacks(self, callbacks):
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                self.logger.error(f"Leader callback {callback} failed: {e}")
+
+    def _promote(self):
+        self.is_leader = True
+        self.leader_since = datetime.utcnow()
+        self.last_heartbeat = self.leader_since
+        self.logger.info(f"Process {os.getpid()} elected scheduler leader")
+        self._run_callbacks(self._elected_callbacks)
+
+    def _demote(self, notify=True):
+        with self._lock:
+            was_leader = self.is_leader
+            self.is_leader = False
+            self.leader_since = None
+            if self._connection is not None:
+                try:
+                    self._connection.execute(text("SELECT pg_advisory_unlock(:lock_id)"), {'lock_id': self.lock_id})
+                except Exception:
+                    pass
+                try:
+                    self._connection.close()
+                except Exception:
+                    pass
+                self._connection = None
+        if was_leader:
+            self.logger.warning(f"Process {os.getpid()} is no longer scheduler leader")
+            if notify:
+                self._run_callbacks(self._demoted_callbacks)
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            try:
+                if self.is_leader:
+                    if self._still_leader():
+                        self.last_heartbeat = datetime.utcnow()
+                    else:
+                        self._demote()
+                elif self._try_acquire():
+                    self._promote()
+            except Exception as e:
+                self.logger.error(f"Leader election error: {e}")
+                if self.is_leader:
+                    # Lost the connection that holds the lock, someone else may take over
+                    self._demote()
+
+            interval = LEADER_HEARTBEAT_INTERVAL if self.is_leader else LEADER_RETRY_INTERVAL
+            self._stop_event.wait(interval)
+
+    def start(self):
+        """Start competing for leadership in a background thread"""
+        with self._lock:
+            if self.thread and self.thread.is_alive():
+                return
+            self._stop_event.clear()
+            self.thread = threading.Thread(target=self._run, name='leader-election', daemon=True)
+            self.thread.start()
+        atexit.register(self.stop)
+        self.logger.info("Leader election started")
+
+    def stop(self, notify=False):
+        """Stop competing and release leadership so a follower can take over quickly.
+
+        Demotion callbacks only run with notify=True, at exit the process is going
+        away anyway and waiting for the scheduler loop would delay the handover.
+        """
+        self._stop_event.set()
+        self._demote(notify=notify)
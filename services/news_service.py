@@ -4,10 +4,32 @@ import threading
 import time
 from datetime import datetime, timedelta
 from bs4 import BeautifulSoup
-from models.news import NewsArticle
+from models.news import NewsArticle, NewsSnapshot, IngestLedger, NewsPollState
 from models.base import db_session
-from config import NEWSDATA_API_KEY
+from sqlalchemy.dialects import postgresql, sqlite
+from config import (
+    NEWSDATA_API_KEY,
+    NEWS_UPDATE_INTERVAL,
+    NEWS_PIPELINE_WORKERS,
+    NEWS_PIPELINE_QUEUE_SIZE,
+    SEEN_ARTICLES_MAX,
+    SEEN_ARTICLES_TTL,
+    INGEST_LEDGER_RETENTION_DAYS,
+    NEWS_DAILY_REQUEST_BUDGET,
+    NEWS_PAGE_SIZE,
+    NEWS_POLL_MAX_PAGES,
+    NEWS_POLL_TARGET,
+    NEWS_KNOWN_IDS,
+    NEWS_FORCE_REFRESH_MIN_INTERVAL,
+    NEWS_REFRESH_WAIT
+)
 from services.image_service import ImageService
+from services.cache_service import PageCache, TTLCache
+from services.pipeline_service import StagedPipeline
+from services.http_service import HttpClient
+from services.image_cache_service import ImageCache
+from services.quota_service import QuotaService
+from services.singleflight_service import SingleFlight
 import hashlib
 import logging
 
@@ -23,7 +45,9 @@ class NewsService:
         'breaking': None,
         'other': []
     }
-    seen_articles = set()  # Track seen articles
+    seen_articles = TTLCache('seen_articles', maxsize=SEEN_ARTICLES_MAX, ttl=SEEN_ARTICLES_TTL)
+    _refresh_thread = None
+    _refresh_lock = threading.Lock()
 
     def __init__(self):
         self.last_update_time = None
@@ -51,180 +75,562 @@ class NewsService:
                     logging.info("Using cached news")
                     return True
 
-            # Set no-cache headers to avoid stale API responses
-            headers = {
-                'Cache-Control': 'no-cache, no-store, must-revalidate',
-                'Pragma': 'no-cache',
-                'Expires': '0'
-            }
-            
-            # Always add a timestamp to prevent caching
-            params = {
-                'apikey': NEWSDATA_API_KEY,
-                'country': 'us,gb',
-                'language': 'en',
-                'category': 'top',
-                'size': 15,  # Get more articles to choose from
-                'timestamp': int(time.time())  # Prevent caching
-            }
-            
-            logging.info("Fetching fresh news from API")
-            try:
-                response = requests.get(
-                    'https://newsdata.io/api/1/news', 
-                    params=params, 
-                    headers=headers,
-                    timeout=15
-                )
-            except requests.exceptions.RequestException as e:
-                logging.error(f"News API request failed: {e}")
-                return False
-                
-            if response.status_code != 200:
-                logging.error(f"News API returned status code {response.status_code}")
+            # Only articles newer than what was already ingested, within the daily request budget
+            new_articles, poll = cls._poll_news()
+            if new_articles is None:
                 return False
-                
+
+            # The cursor only moves past articles once they're published, so ones lost to a
+            # failed stage, a failed publish or a crash are polled again next cycle
+            published = False
+            failed_hashes = set()
             try:
-                data = response.json()
-            except ValueError:
-                logging.error("Failed to parse API response as JSON")
-                return False
-                
-            articles = data.get('results', [])
-            
-            if not articles:
-                logging.warning("News API returned no articles")
-                return False
-                
-            logging.info(f"Received {len(articles)} articles from news API")
+                # The current front page competes with the new articles, it's in the ledger so costs no fetches
+                articles = new_articles + cls._current_articles()
+                if not articles:
+                    logging.warning("News API returned no articles")
+                    return False
+
+                logging.info(f"Received {len(new_articles)} new articles from news API")
             
-            # Sort articles by published date (newest first)
-            sorted_articles = []
-            for article in articles:
-                try:
-                    if 'pubDate' in article and article.get('title') and article.get('link'):
-                        pub_date = datetime.fromisoformat(article['pubDate'].replace('Z', '+00:00'))
-                        sorted_articles.append((pub_date, article))
-                except (ValueError, TypeError) as e:
-                    logging.warning(f"Error parsing article date: {e}")
+                # Sort articles by published date (newest first)
+                sorted_articles = []
+                for article in articles:
+                    try:
+                        if 'pubDate' in article and article.get('title') and article.get('link'):
+                            pub_date = datetime.fromisoformat(article['pubDate'].replace('Z', '+00:00'))
+                            sorted_articles.append((pub_date, article))
+                    except (ValueError, TypeError) as e:
+                        logging.warning(f"Error parsing article date: {e}")
                     
-            sorted_articles.sort(reverse=True)  # Sort by date, newest first
-            sorted_articles = [article for _, article in sorted_articles]
+                sorted_articles.sort(key=lambda pair: pair[0], reverse=True)  # Sort by date, newest first
+                sorted_articles = [article for _, article in sorted_articles]
             
-            if not sorted_articles:
-                logging.warning("No valid articles after sorting")
-                return False
+                if not sorted_articles:
+                    logging.warning("No valid articles after sorting")
+                    return False
                 
-            with db_session() as session:
-                try:
-                    # Clear old articles
-                    session.query(NewsArticle).delete()
-                    
-                    # Process breaking news - use the freshest article
-                    breaking_news = None
-                    if sorted_articles:
-                        breaking_news = cls._process_article(sorted_articles[0], is_breaking=True)
-                        if breaking_news:
-                            session.add(breaking_news)
-                            logging.info(f"Added breaking news: {breaking_news.title}")
-                        else:
-                            logging.warning("Failed to process breaking news article")
-                    
-                    # Process other news
-                    other_news = []
-                    seen_titles = set()
-                    
-                    if breaking_news:
-                        seen_titles.add(breaking_news.title)
-
-                    # Process up to 5 additional articles
-                    for article in sorted_articles[1:]:
-                        if len(other_news) >= 5:
-                            break
-                            
-                        title = article.get('title', '')
-                        if title and title not in seen_titles:
-                            seen_titles.add(title)
-                            news_article = cls._process_article(article)
-                            if news_article:
-                                other_news.append(news_article)
-                                logging.info(f"Added regular news: {news_article.title}")
-
-                    session.add_all(other_news)
-                    session.commit()
-
-                    # Update cache with correct counts
-                    cls._cache.update({
-                        'articles': {
+                # Breaking news is the freshest article, then up to 5 others with distinct titles and content
+                candidates = []
+                seen_titles = set()
+                seen_hashes = set()
+                for article in sorted_articles:
+                    article_hash = cls.content_hash(article)
+                    if article['title'] not in seen_titles and article_hash not in seen_hashes:
+                        seen_titles.add(article['title'])
+                        seen_hashes.add(article_hash)
+                        candidates.append((article_hash, article))
+
+                # Articles in the ledger were processed before, by this or any other worker
+                ledger = cls.ledger_lookup(seen_hashes)
+
+                # Images are resolved before opening the session so no transaction waits on the network
+                breaking_item, other_items, failed_hashes = cls._ingest(candidates, ledger, wanted=6)
+                items = ([breaking_item] if breaking_item else []) + other_items
+                if breaking_item:
+                    logging.info(f"Added breaking news: {breaking_item['data']['title']}")
+                else:
+                    logging.warning("Failed to process breaking news article")
+                for item in other_items:
+                    logging.info(f"Added regular news: {item['data']['title']}")
+
+                if not items:
+                    # Keep the current front page rather than publishing an empty one
+                    logging.warning("No articles processed, keeping current news")
+                    return False
+
+                with db_session() as session:
+                    try:
+                        cls._publish(session, items)
+                        cls._record_ledger(session, items)
+                        session.commit()
+                        published = True
+
+                        current = session.query(NewsArticle).filter_by(is_current=True)\
+                                         .order_by(NewsArticle.rank).all()
+                        breaking_news = next((article for article in current if article.is_breaking), None)
+                        other_news = [article for article in current if not article.is_breaking]
+
+                        # Everything the news page needs, so rendering it costs one read
+                        cls.save_snapshot(
+                            session,
+                            breaking_news,
+                            other_news,
+                            next_update=current_time + timedelta(seconds=NEWS_UPDATE_INTERVAL)
+                        )
+
+                        # Update cache with correct counts
+                        cls._cache.update({
+                            'articles': {
+                                'breaking': breaking_news,
+                                'other': other_news
+                            },
                             'breaking': breaking_news,
-                            'other': other_news
-                        },
-                        'breaking': breaking_news,
-                        'other': other_news,
-                        'last_fetch': current_time,
-                        'next_update': current_time + timedelta(seconds=1800),  # 30 minutes
-                        'total': len(other_news) + (1 if breaking_news else 0)
-                    })
+                            'other': other_news,
+                            'last_fetch': current_time,
+                            'next_update': current_time + timedelta(seconds=1800),  # 30 minutes
+                            'total': len(other_news) + (1 if breaking_news else 0)
+                        })
 
-                    logging.info(f"Updated news at {current_time}, total articles: {len(other_news) + (1 if breaking_news else 0)}")
-                    return True
+                        logging.info(f"Updated news at {current_time}, total articles: {len(other_news) + (1 if breaking_news else 0)}")
+                        return True
                     
-                except Exception as e:
-                    logging.error(f"Database error when saving news: {e}")
-                    session.rollback()
-                    return False
+                    except Exception as e:
+                        logging.error(f"Database error when saving news: {e}")
+                        session.rollback()
+                        return False
+            finally:
+                cls._save_poll_state(poll, new_articles if published else [], failed_hashes)
 
         except Exception as e:
             logging.error(f"Error fetching news: {e}")
             return False
 
     @classmethod
-    def _process_article(cls, article_data, is_breaking=False):
+    def save_snapshot(cls, session, breaking_news, other_news, next_update):
+        """Store the rendered-page inputs for /news: articles and next update"""
+        articles = ([breaking_news] if breaking_news else []) + list(other_news)
+        # Read before the commit expires the articles
+        image_urls = [article.image_url for article in articles if article.image_url]
+
+        def serialize(article):
+            data = article.to_dict()
+            data['published_at'] = article.published_at.isoformat() if article.published_at else None
+            return data
+
         try:
-            # Create hash for deduplication
-            article_hash = hashlib.md5(
-                f"{article_data['title']}{article_data['description']}".encode()
-            ).hexdigest()
-            
-            # Skip if already seen
-            if article_hash in cls.seen_articles:
+            session.merge(NewsSnapshot(
+                name='news',
+                payload={
+                    'breaking': serialize(breaking_news) if breaking_news else None,
+                    'other': [serialize(article) for article in other_news],
+                    'next_update': next_update.isoformat()
+                },
+                created_at=datetime.utcnow()
+            ))
+            session.commit()
+            PageCache.invalidate('news')
+        except Exception as e:
+            # The articles are saved, the page keeps showing the previous snapshot
+            logging.error(f"Error saving news snapshot: {e}")
+            session.rollback()
+            return
+
+        try:
+            # Images on the live page must survive eviction
+            ImageCache.pin_only(image_urls)
+        except Exception as e:
+            logging.error(f"Error pinning news images: {e}")
+
+    @classmethod
+    def get_snapshot(cls):
+        """Latest news page snapshot with dates parsed back, None if the news job hasn't run yet"""
+        snapshot = NewsSnapshot.query.get('news')
+        if not snapshot:
+            return None
+
+        def deserialize(data):
+            if not data:
                 return None
-                
-            cls.seen_articles.add(article_hash)
-            
-            # Generate image path
-            image_path = f"static/images/generated/{article_hash}.jpg"
-            final_image_path = None
-            
-            # Handle image
-            if article_data.get('image_url'):
-                final_image_path = ImageService.get_cached_image(
-                    article_data['image_url'],
-                    image_path
-                )
-            
-            if not final_image_path:
-                final_image_path = ImageService.generate_news_image(
-                    article_data['title'],
-                    article_data['link'],
-                    image_path
-                )
-            
-            # Create article
-            return NewsArticle(
-                title=article_data['title'],
-                description=article_data['description'],
-                url=article_data['link'],
-                image_url=f"/{image_path}" if final_image_path else None,
-                published_at=datetime.fromisoformat(article_data['pubDate'].replace('Z', '+00:00')),
-                source=article_data['source_id'],
-                category='breaking' if is_breaking else 'news',
-                is_breaking=is_breaking
+            data = dict(data)
+            if data.get('published_at'):
+                data['published_at'] = datetime.fromisoformat(data['published_at'])
+            return data
+
+        payload = snapshot.payload
+        return {
+            'breaking': deserialize(payload.get('breaking')),
+            'other': [deserialize(article) for article in payload.get('other', [])],
+            'next_update': datetime.fromisoformat(payload['next_update']),
+            'created_at': snapshot.created_at
+        }
+
+    @classmethod
+    def _poll_news(cls):
+        """(new API articles since the last poll, poll state to save once they're published),
+        (None, None) if the API couldn't be reached.
+
+        Pages newest first and stops at the first page holding known content
+        (a remembered article id, or a pubDate not after the cursor), when
+        there is no nextPage, once NEWS_POLL_TARGET new articles are in, or
+        when the shared daily request budget is spent.
+        """
+        state = NewsPollState.query.get('newsdata') or NewsPollState(name='newsdata', known_ids=[])
+        known_ids = set(state.known_ids or [])
+        cursor = state.newest_published_at
+
+        new_articles = []
+        cycle = {'requests': 0, 'received': 0, 'new': 0, 'stopped': None}
+        page_token = None
+        while True:
+            if cycle['requests'] >= NEWS_POLL_MAX_PAGES:
+                cycle['stopped'] = 'max_pages'
+                break
+
+            allowed, used_today = QuotaService.reserve('newsdata', NEWS_DAILY_REQUEST_BUDGET)
+            if not allowed:
+                logging.warning(f"News API daily budget of {NEWS_DAILY_REQUEST_BUDGET} requests spent")
+                cycle['stopped'] = 'budget'
+                break
+            cycle['requests'] += 1
+
+            params = {
+                'apikey': NEWSDATA_API_KEY,
+                'country': 'us,gb',
+                'language': 'en',
+                'category': 'top',
+                'size': NEWS_PAGE_SIZE
+            }
+            if page_token:
+                params['page'] = page_token
+
+            try:
+                response = HttpClient.get('newsdata', 'https://newsdata.io/api/1/news', params=params)
+                if response.status_code != 200:
+                    raise ValueError(f"status code {response.status_code}")
+                data = response.json()
+            except (requests.exceptions.RequestException, ValueError) as e:
+                logging.error(f"News API request failed: {e}")
+                cycle['stopped'] = 'error'
+                break
+
+            results = data.get('results') or []
+            fresh = [article for article in results if not cls._is_known(article, known_ids, cursor)]
+            cycle['received'] += len(results)
+            new_articles.extend(fresh)
+
+            page_token = data.get('nextPage')
+            if len(fresh) < len(results):
+                cycle['stopped'] = 'known_content'
+                break
+            if not page_token:
+                cycle['stopped'] = 'last_page'
+                break
+            if len(new_articles) >= NEWS_POLL_TARGET:
+                cycle['stopped'] = 'enough'
+                break
+
+        cycle['new'] = len(new_articles)
+        poll = {'newest_published_at': cursor, 'known_ids': list(state.known_ids or []), 'cycle': cycle}
+        if cycle['stopped'] == 'error' and cycle['received'] == 0:
+            cls._save_poll_state(poll, [])
+            return None, None
+        return new_articles, poll
+
+    @staticmethod
+    def _published_at(article_data):
+        try:
+            return datetime.fromisoformat(article_data['pubDate'].replace('Z', '+00:00'))
+        except (KeyError, AttributeError, ValueError, TypeError):
+            return None
+
+    @classmethod
+    def _is_known(cls, article_data, known_ids, cursor):
+        if article_data.get('article_id') in known_ids:
+            return True
+        published_at = cls._published_at(article_data)
+        return bool(cursor and published_at and published_at <= cursor)
+
+    @classmethod
+    def _save_poll_state(cls, poll, new_articles, failed_hashes=()):
+        """Record the cycle's quota use and advance the cursor past the published new articles.
+
+        Articles whose ingestion failed stay unknown: their ids aren't remembered
+        and the cursor stops short of the oldest of them, so they're polled again.
+        """
+        cycle = poll['cycle']
+        try:
+            failed = [article for article in new_articles if cls.content_hash(article) in failed_hashes]
+            seen = [article for article in new_articles if cls.content_hash(article) not in failed_hashes]
+
+            cursor = poll['newest_published_at']
+            dates = [date for date in map(cls._published_at, seen) if date] + ([cursor] if cursor else [])
+            newest = max(dates) if dates else None
+            failed_dates = [date for date in map(cls._published_at, failed) if date]
+            if newest and failed_dates:
+                newest = min(newest, min(failed_dates) - timedelta(microseconds=1))
+                newest = max(newest, cursor) if cursor else newest
+            ids = [article['article_id'] for article in seen if article.get('article_id')]
+
+            last_cycle = dict(
+                cycle,
+                failed=len(failed),
+                at=datetime.utcnow().isoformat(),
+                used_today=QuotaService.usage('newsdata'),
+                budget=NEWS_DAILY_REQUEST_BUDGET
             )
+            db_session.merge(NewsPollState(
+                name='newsdata',
+                newest_published_at=newest,
+                known_ids=(poll['known_ids'] + ids)[-NEWS_KNOWN_IDS:],
+                last_cycle=last_cycle
+            ))
+            db_session.commit()
+            logging.info(f"News poll: {cycle['requests']} requests, {cycle['received']} received, "
+                         f"{cycle['new']} new ({len(seen)} published, {len(failed)} failed), "
+                         f"stopped on {cycle['stopped']}, "
+                         f"{last_cycle['used_today']}/{NEWS_DAILY_REQUEST_BUDGET} used today")
+        except Exception as e:
+            logging.error(f"Error saving news poll state: {e}")
+            db_session.rollback()
 
+    @staticmethod
+    def _current_articles():
+        """The current front page in the API's article shape"""
+        try:
+            return [
+                {
+                    'title': article.title,
+                    'description': article.description,
+                    'link': article.url,
+                    'pubDate': article.published_at.isoformat(),
+                    'source_id': article.source,
+                    'image_url': None
+                }
+                for article in NewsArticle.query.filter_by(is_current=True)
+                if article.published_at
+            ]
         except Exception as e:
-            logging.error(f"Error processing article: {e}")
-            return None
+            logging.error(f"Error reading current news: {e}")
+            db_session.rollback()
+            return []
+
+    @classmethod
+    def polling_status(cls):
+        """Today's news API quota use and the last poll cycle, for the admin pages"""
+        state = NewsPollState.query.get('newsdata')
+        return {
+            'used_today': QuotaService.usage('newsdata'),
+            'budget': NEWS_DAILY_REQUEST_BUDGET,
+            'last_cycle': state.last_cycle if state else None
+        }
+
+    @staticmethod
+    def content_hash(article_data):
+        """Ledger key of an API article"""
+        return hashlib.md5(
+            f"{article_data['title']}{article_data.get('description')}".encode()
+        ).hexdigest()
+
+    @classmethod
+    def ledger_lookup(cls, hashes):
+        """Resolved image path ('' for none) of every already ingested hash.
+
+        seen_articles holds recent entries in memory, the rest come from one
+        primary key lookup on the ingest ledger.
+        """
+        known = {}
+        missing = []
+        for article_hash in hashes:
+            image_path = cls.seen_articles.get(article_hash)
+            if image_path is None:
+                missing.append(article_hash)
+            else:
+                known[article_hash] = image_path
+
+        if missing:
+            try:
+                for entry in IngestLedger.query.filter(IngestLedger.content_hash.in_(missing)):
+                    known[entry.content_hash] = entry.image_path or ''
+                    cls.seen_articles[entry.content_hash] = entry.image_path or ''
+            except Exception as e:
+                # Without the ledger everything is processed again, as on a first run
+                logging.error(f"Error reading ingest ledger: {e}")
+                db_session.rollback()
+        return known
+
+    @classmethod
+    def _record_ledger(cls, session, items):
+        """Add newly processed articles to the ingest ledger"""
+        now = datetime.utcnow()
+        for item in items:
+            if item['from_ledger']:
+                continue
+            image_path = item['image_path'] if item['final_image_path'] else None
+            session.merge(IngestLedger(
+                content_hash=item['hash'],
+                source_url=item['data']['link'],
+                image_path=image_path,
+                processed_at=now
+            ))
+            cls.seen_articles[item['hash']] = image_path or ''
+
+    @classmethod
+    def prune_ledger(cls, days=INGEST_LEDGER_RETENTION_DAYS):
+        """Forget articles processed more than `days` ago"""
+        try:
+            cutoff = datetime.utcnow() - timedelta(days=days)
+            count = IngestLedger.query.filter(IngestLedger.processed_at < cutoff).delete(synchronize_session=False)
+            db_session.commit()
+            return count
+        except Exception as e:
+            logging.error(f"Error pruning ingest ledger: {e}")
+            db_session.rollback()
+            return 0
+
+    @classmethod
+    def _ingest(cls, candidates, ledger, wanted):
+        """Run (hash, article) candidates through the ingestion stages concurrently.
+
+        Stages: extract (metadata, article page image) -> download (image URL,
+        article page, then Unsplash) -> compress (Pillow, to disk), and the
+        caller persists. Articles found in `ledger` skip straight through with
+        their recorded image. The first `wanted` candidates are fed at once,
+        with the next candidate fed whenever one is dropped, so a cycle takes
+        about as long as its slowest article. Returns (breaking, others) items
+        and the hashes of candidates a stage dropped.
+        """
+        results = {}
+        failed = set()
+        remaining = iter(enumerate(candidates))
+        in_flight = 0
+        stages = [
+            ('extract', cls._extract_stage, NEWS_PIPELINE_WORKERS['extract']),
+            ('download', cls._download_stage, NEWS_PIPELINE_WORKERS['download']),
+            ('compress', cls._compress_stage, NEWS_PIPELINE_WORKERS['compress'])
+        ]
+
+        with StagedPipeline('news-ingest', stages, NEWS_PIPELINE_QUEUE_SIZE) as pipeline:
+            def feed():
+                nonlocal in_flight
+                for index, (article_hash, article_data) in remaining:
+                    pipeline.put(index, {
+                        'data': article_data,
+                        'hash': article_hash,
+                        'is_breaking': index == 0,
+                        'ledger_image': ledger.get(article_hash)
+                    })
+                    in_flight += 1
+                    return
+
+            for _ in range(wanted):
+                feed()
+            while in_flight:
+                index, item = pipeline.get()
+                in_flight -= 1
+                if item is None:
+                    failed.add(candidates[index][0])
+                    feed()
+                else:
+                    results[index] = item
+
+        breaking_item = results.pop(0, None)
+        return breaking_item, [results[index] for index in sorted(results)][:wanted - 1], failed
+
+    @classmethod
+    def _extract_stage(cls, item):
+        """Parse the article's metadata and find its page image if the API gave none"""
+        article_data = item['data']
+        item.update({
+            'description': article_data['description'],
+            'image_path': f"static/images/generated/{item['hash']}.jpg",
+            'published_at': datetime.fromisoformat(article_data['pubDate'].replace('Z', '+00:00')),
+            'source': article_data['source_id'],
+            'image_urls': [],
+            'page_checked': False,
+            'final_image_path': None,
+            'from_ledger': item['ledger_image'] is not None
+        })
+
+        if item['from_ledger']:
+            # Processed before, reuse the result instead of fetching anything again
+            if item['ledger_image']:
+                item['image_path'] = item['ledger_image']
+                item['final_image_path'] = item['ledger_image']
+                if not ImageCache.existing([item['ledger_image']]):
+                    ImageService.queue_regeneration(article_data['title'], article_data['link'], item['ledger_image'])
+            return item
+
+        if os.path.exists(item['image_path']):
+            item['final_image_path'] = item['image_path']
+        elif article_data.get('image_url'):
+            item['image_urls'].append(article_data['image_url'])
+        else:
+            page_image = ImageService.get_article_image(article_data['link'])
+            item['page_checked'] = True
+            if page_image:
+                item['image_urls'].append(page_image)
+        return item
+
+    @classmethod
+    def _download_stage(cls, item):
+        """Download the first image that works: API image, article page image, then Unsplash"""
+        if item['final_image_path'] or item['from_ledger']:
+            return item
+
+        def download(urls):
+            for url in urls:
+                image_data = ImageService.download_image(url)
+                if image_data:
+                    item['image_data'] = image_data
+                    item['image_source'] = url
+                    return True
+            return False
+
+        if download(item['image_urls']):
+            return item
+
+        if not item['page_checked']:
+            page_image = ImageService.get_article_image(item['data']['link'])
+            if page_image and download([page_image]):
+                return item
+
+        if download(ImageService.search_unsplash(item['data']['title'])):
+            ImageService.used_images.add(item['image_source'])
+        return item
+
+    @classmethod
+    def _compress_stage(cls, item):
+        """Compress the downloaded image to the article's image path"""
+        if item.get('image_data'):
+            item['final_image_path'] = ImageService.save_image(
+                item.pop('image_data'),
+                item['image_path'],
+                item['image_source']
+            )
+        return item
+
+    @staticmethod
+    def _article_row(item, rank, now):
+        article_data = item['data']
+        return {
+            'article_hash': item['hash'],
+            'title': article_data['title'],
+            'description': item['description'],
+            'url': article_data['link'],
+            'image_url': f"/{item['image_path']}" if item['final_image_path'] else None,
+            'published_at': item['published_at'],
+            'source': item['source'],
+            'category': 'breaking' if item['is_breaking'] else 'news',
+            'is_breaking': item['is_breaking'],
+            'is_current': True,
+            'rank': rank,
+            'updated_at': now
+        }
+
+    @classmethod
+    def _publish(cls, session, items):
+        """Make items the front page, in order, within the caller's transaction.
+
+        Articles are upserted on their hash, and whatever was current before
+        moves to the archive (is_current false) in the same transaction, so
+        readers see either the old front page or the new one, never a gap.
+        """
+        now = datetime.utcnow()
+        rows = [cls._article_row(item, rank, now) for rank, item in enumerate(items)]
+        hashes = [row['article_hash'] for row in rows]
+
+        session.query(NewsArticle)\
+               .filter(NewsArticle.is_current.is_(True), NewsArticle.article_hash.notin_(hashes))\
+               .update({'is_current': False, 'rank': None}, synchronize_session=False)
+
+        insert = postgresql.insert if session.bind.dialect.name == 'postgresql' else sqlite.insert
+        statement = insert(NewsArticle.__table__).values(rows)
+        statement = statement.on_conflict_do_update(
+            index_elements=['article_hash'],
+            set_={column: statement.excluded[column] for column in rows[0] if column != 'article_hash'}
+        )
+        session.execute(statement)
 
     @classmethod
     def start_scheduler(cls):
@@ -245,13 +651,70 @@ class NewsService:
         print("News scheduler started")
 
     @classmethod
-    def force_refresh(cls):
-        """Force an immediate refresh of news"""
+    def refresh(cls, wait=True, min_interval=NEWS_FORCE_REFRESH_MIN_INTERVAL):
+        """Fetch news once however many threads and workers ask at the same time.
+
+        Returns 'refreshed' or 'failed' for the call that ran, 'fresh' when any
+        worker polled the API within min_interval seconds, 'joined' when another
+        worker's refresh finished while waiting, or 'busy' when one is running
+        and wait is False.
+        """
+        if cls.polled_within(min_interval):
+            return 'fresh'
+
+        def run():
+            # Checked again under the lock, a refresh may have finished while we queued for it
+            if cls.polled_within(min_interval):
+                return 'fresh'
+            return 'refreshed' if cls.fetch_news(force_breaking=True) else 'failed'
+
+        status, result = SingleFlight.run('news-refresh', run, wait=wait, timeout=NEWS_REFRESH_WAIT)
+        return result or status
+
+    @staticmethod
+    def polled_within(seconds):
+        """Whether any worker attempted a news API poll in the last `seconds`"""
+        if not seconds:
+            return False
+        try:
+            state = NewsPollState.query.get('newsdata')
+            return bool(state and state.updated_at and
+                        state.updated_at > datetime.utcnow() - timedelta(seconds=seconds))
+        except Exception as e:
+            logging.error(f"Error reading news poll state: {e}")
+            db_session.rollback()
+            return False
+
+    @classmethod
+    def force_refresh(cls, wait=True):
+        """Force an immediate refresh of news, at most once per NEWS_FORCE_REFRESH_MIN_INTERVAL"""
         current_time = datetime.utcnow()
+        status = cls.refresh(wait=wait)
         # Only reset next_update_time if successful
-        if cls.get_instance().fetch_news(force_breaking=True):
+        if status == 'refreshed':
             cls.get_instance().last_update_time = current_time
             cls.get_instance().next_update_time = current_time + timedelta(seconds=cls.get_instance().breaking_news_check_interval)
+        return status
+
+    @classmethod
+    def refresh_in_background(cls):
+        """Start force_refresh on a background thread, False if this worker already has one running"""
+        with cls._refresh_lock:
+            if cls._refresh_thread and cls._refresh_thread.is_alive():
+                return False
+            cls._refresh_thread = threading.Thread(target=cls._background_refresh, name='news-refresh', daemon=True)
+            cls._refresh_thread.start()
+        return True
+
+    @classmethod
+    def _background_refresh(cls):
+        try:
+            status = cls.force_refresh(wait=False)
+            logging.info(f"Background news refresh: {status}")
+        except Exception as e:
+            logging.error(f"Background news refresh failed: {e}")
+        finally:
+            db_session.remove()
 
     @classmethod
     def get_cached_news(cls):
@@ -271,24 +734,24 @@ class NewsService:
             # Cache invalid or empty, so get from database
             logging.info("Cache invalid, getting news from database")
             with db_session() as session:
-                breaking_news = session.query(NewsArticle).filter_by(is_breaking=True)\
+                breaking_news = session.query(NewsArticle).filter_by(is_breaking=True, is_current=True)\
                                     .order_by(NewsArticle.published_at.desc())\
                                     .first()
-                other_news = session.query(NewsArticle).filter_by(is_breaking=False)\
-                                  .order_by(NewsArticle.published_at.desc())\
+                other_news = session.query(NewsArticle).filter_by(is_breaking=False, is_current=True)\
+                                  .order_by(NewsArticle.rank)\
                                   .limit(5)\
                                   .all()
                 
                 if not breaking_news and not other_news:
                     logging.warning("No news articles in database, triggering refresh")
-                    # Try to fetch fresh news
-                    if cls.fetch_news(force_breaking=True):
+                    # Join any refresh already running rather than starting another
+                    if cls.refresh() in ('refreshed', 'joined'):
                         # Try again from database
-                        breaking_news = session.query(NewsArticle).filter_by(is_breaking=True)\
+                        breaking_news = session.query(NewsArticle).filter_by(is_breaking=True, is_current=True)\
                                         .order_by(NewsArticle.published_at.desc())\
                                         .first()
-                        other_news = session.query(NewsArticle).filter_by(is_breaking=False)\
-                                      .order_by(NewsArticle.published_at.desc())\
+                        other_news = session.query(NewsArticle).filter_by(is_breaking=False, is_current=True)\
+                                      .order_by(NewsArticle.rank)\
                                       .limit(5)\
                                       .all()
                 
@@ -0,0 +1,85 @@
+# services/pipeline_service.py
+import logging
+import queue
+import threading
+
+class StagedPipeline:
+    """Items flow through named stages, each with its own worker threads,
+    connected by bounded queues so a slow stage applies backpressure upstream.
+
+    Each stage function takes an item and returns the item for the next stage,
+    or None to drop it. Every item put in comes out of `get()` exactly once as
+    (key, item), with item None when a stage dropped it or raised.
+    """
+    _STOP = object()
+
+    def __init__(self, name, stages, queue_size=8):
+        self.name = name
+        self.stages = stages  # [(stage name, func, worker count)]
+        self._queues = [queue.Queue(maxsize=queue_size) for _ in stages]
+        self._results = queue.Queue()
+        self._threads = []
+        self._finished = [0] * len(stages)
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def start(self):
+        for index, (stage_name, _, workers) in enumerate(self.stages):
+            for number in range(workers):
+                thread = threading.Thread(
+                    target=self._work,
+                    args=(index,),
+                    name=f"{self.name}-{stage_name}-{number}",
+                    daemon=True
+                )
+                thread.start()
+                self._threads.append(thread)
+
+    def put(self, key, item):
+        """Feed an item into the first stage, blocking while it's full"""
+        self._queues[0].put((key, item))
+
+    def get(self, timeout=None):
+        """Next finished (key, item), in completion order"""
+        return self._results.get(timeout=timeout)
+
+    def close(self):
+        """Let queued items drain, then stop every stage in order"""
+        for _ in range(self.stages[0][2]):
+            self._queues[0].put(self._STOP)
+        for thread in self._threads:
+            thread.join()
+
+    def _work(self, index):
+        stage_name, func, _ = self.stages[index]
+        last = index == len(self.stages) - 1
+        while True:
+            entry = self._queues[index].get()
+            if entry is self._STOP:
+                break
+
+            key, item = entry
+            try:
+                item = func(item)
+            except Exception as e:
+                logging.error(f"{self.name} {stage_name} stage failed for {key}: {e}")
+                item = None
+
+            if item is None or last:
+                self._results.put((key, item))
+            else:
+                self._queues[index + 1].put((key, item))
+
+        # The last worker out of a stage stops the next one
+        with self._lock:
+            self._finished[index] += 1
+            done = self._finished[index] == self.stages[index][2]
+        if done and not last:
+            for _ in range(self.stages[index + 1][2]):
+                self._queues[index + 1].put(self._STOP)
@@ -0,0 +1,40 @@
+# services/quota_service.py
+from datetime import datetime
+from sqlalchemy.dialects import postgresql, sqlite
+from models.base import db_session, engine
+from models.api_quota import ApiQuota
+
+class QuotaService:
+    """Daily request budgets for metered APIs, enforced across workers by the database"""
+
+    @staticmethod
+    def _insert():
+        return postgresql.insert if engine.dialect.name == 'postgresql' else sqlite.insert
+
+    @classmethod
+    def reserve(cls, api, budget):
+        """Count one request against today's budget: (allowed, requests used today).
+
+        A single conditional upsert, so concurrent workers can't overspend.
+        """
+        table = ApiQuota.__table__
+        statement = cls._insert()(table).values(api=api, day=datetime.utcnow().date(), requests=1)
+        statement = statement.on_conflict_do_update(
+            index_elements=['api', 'day'],
+            set_={'requests': table.c.requests + 1},
+            where=table.c.requests < budget
+        ).returning(table.c.requests)
+        try:
+            used = db_session.execute(statement).scalar()
+            db_session.commit()
+        except Exception:
+            db_session.rollback()
+            raise
+        if used is None:
+            return False, budget
+        return True, used
+
+    @classmethod
+    def usage(cls, api):
+        quota = ApiQuota.query.get((api, datetime.utcnow().date()))
+        return quota.requests if quota else 0
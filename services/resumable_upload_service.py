@@ -0,0 +1,204 @@
+# services/resumable_upload_service.py
+import json
+import logging
+import os
+import secrets
+import shutil
+import tempfile
+import time
+from config import (
+    UPLOAD_TMP_DIR,
+    UPLOAD_BUFFER_SIZE,
+    RESUMABLE_UPLOAD_DIR,
+    RESUMABLE_CHUNK_SIZE,
+    RESUMABLE_UPLOAD_EXPIRY_HOURS
+)
+
+class ResumableUploadService:
+    """tus-style resumable uploads assembled on local disk.
+
+    Each upload is a directory holding info.json, a data file preallocated to
+    the declared length and one empty marker per fully written chunk. Chunks
+    are fixed-size and may arrive in any order or in parallel, so state lives
+    on disk where every gunicorn worker in the container can see it.
+    """
+    base_dir = RESUMABLE_UPLOAD_DIR or os.path.join(tempfile.gettempdir(), 'resumable_uploads')
+    chunk_size = RESUMABLE_CHUNK_SIZE
+    expiry_seconds = RESUMABLE_UPLOAD_EXPIRY_HOURS * 3600
+
+    @classmethod
+    def _path(cls, upload_id, *parts):
+        if not upload_id or not upload_id.isalnum():
+            raise KeyError(upload_id)
+        return os.path.join(cls.base_dir, upload_id, *parts)
+
+    @classmethod
+    def create(cls, kind, filename, length, metadata=None, attachments=None):
+        """Register a new upload and preallocate its data file, returns the upload info.
+
+        attachments maps names to already spooled files (e.g. a thumbnail) that
+        are handed over together with the data once the upload completes.
+        """
+        cls.cleanup_expired()
+
+        upload_id = secrets.token_hex(16)
+        os.makedirs(cls._path(upload_id, 'chunks'))
+        with open(cls._path(upload_id, 'data'), 'wb') as f:
+            f.truncate(length)
+
+        info = {
+            'id': upload_id,
+            'kind': kind,
+            'filename': filename,
+            'length': length,
+            'chunk_size': cls.chunk_size,
+            'chunks': cls.chunk_count(length),
+            'metadata': metadata or {},
+            'attachments': {},
+            'created_at': time.time()
+        }
+        for name, path in (attachments or {}).items():
+            target = cls._path(upload_id, f'attachment_{name}{os.path.splitext(path)[1]}')
+            shutil.move(path, target)
+            info['attachments'][name] = target
+
+        with open(cls._path(upload_id, 'info.json'), 'w') as f:
+            json.dump(info, f)
+        logging.info(f"Created resumable {kind} upload {upload_id} ({length} bytes)")
+        return info
+
+    @classmethod
+    def chunk_count(cls, length):
+        return max(1, -(-length // cls.chunk_size))
+
+    @classmethod
+    def get_info(cls, upload_id):
+        """Upload info or None if the upload does not exist or has expired"""
+        try:
+            with open(cls._path(upload_id, 'info.json')) as f:
+                return json.load(f)
+        except (KeyError, FileNotFoundError):
+            return None
+
+    @classmethod
+    def received_chunks(cls, upload_id):
+        try:
+            return sorted(int(name) for name in os.listdir(cls._path(upload_id, 'chunks')))
+        except FileNotFoundError:
+            return []
+
+    @classmethod
+    def offset(cls, info, received=None):
+        """Bytes received contiguously from the start of the file (tus Upload-Offset)"""
+        received = set(received if received is not None else cls.received_chunks(info['id']))
+        index = 0
+        while index in received:
+            index += 1
+        return min(index * info['chunk_size'], info['length'])
+
+    @classmethod
+    def write_chunk(cls, info, offset, stream, content_length):
+        """Write one chunk at a chunk-aligned offset, returns the chunk index.
+
+        Raises ValueError when the offset or length doesn't match a chunk.
+        """
+        chunk_size = info['chunk_size']
+        if offset < 0 or offset % chunk_size or offset >= max(info['length'], 1):
+            raise ValueError(f'Upload-Offset {offset} is not the start of a chunk')
+        index = offset // chunk_size
+        expected = min(chunk_size, info['length'] - offset)
+        if content_length != expected:
+            raise ValueError(f'Chunk {index} must be {expected} bytes, got {content_length}')
+
+        written = 0
+        with open(cls._path(info['id'], 'data'), 'r+b') as f:
+            f.seek(offset)
+            while written < expected:
+                data = stream.read(min(UPLOAD_BUFFER_SIZE, expected - written))
+                if not data:
+                    break
+                f.write(data)
+                written += len(data)
+            f.flush()
+            os.fsync(f.fileno())
+
+        if written != expected:
+            # Connection dropped mid-chunk, the client resends the whole chunk
+            raise ValueError(f'Chunk {index} incomplete: {written} of {expected} bytes')
+
+        # Marker only after the bytes are on disk so HEAD never over-reports
+        open(cls._path(info['id'], 'chunks', str(index)), 'w').close()
+        return index
+
+    @classmethod
+    def claim_completion(cls, info):
+        """True for exactly one caller once every chunk has been received"""
+        if len(cls.received_chunks(info['id'])) < info['chunks']:
+            return False
+        try:
+            fd = os.open(cls._path(info['id'], 'complete'), os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            return False
+        os.close(fd)
+        return True
+
+    @classmethod
+    def set_job(cls, info, job_id):
+        """Record the processing job of a completed upload for clients that lost the response"""
+        with open(cls._path(info['id'], 'complete'), 'w') as f:
+            f.write(job_id)
+
+    @classmethod
+    def get_job(cls, info):
+        """Processing job id of a completed upload, None while chunks are outstanding"""
+        try:
+            with open(cls._path(info['id'], 'complete')) as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    @classmethod
+    def take_files(cls, info):
+        """Move the assembled data and attachments out to spool files.
+
+        Returns (data_path, {name: attachment_path}), owned by the caller. Only
+        info.json and the completion marker stay behind until expiry.
+        """
+        def spool_path(suffix):
+            fd, path = tempfile.mkstemp(prefix='upload_', suffix=suffix, dir=UPLOAD_TMP_DIR)
+            os.close(fd)
+            return path
+
+        data_path = spool_path(os.path.splitext(info['filename'])[1].lower())
+        shutil.move(cls._path(info['id'], 'data'), data_path)
+        attachments = {}
+        for name, path in info['attachments'].items():
+            attachments[name] = spool_path(os.path.splitext(path)[1])
+            shutil.move(path, attachments[name])
+        shutil.rmtree(cls._path(info['id'], 'chunks'), ignore_errors=True)
+        return data_path, attachments
+
+    @classmethod
+    def discard(cls, upload_id):
+        try:
+            shutil.rmtree(cls._path(upload_id), ignore_errors=True)
+        except KeyError:
+            pass
+
+    @classmethod
+    def cleanup_expired(cls):
+        """Remove uploads abandoned for longer than the expiry window"""
+        if not os.path.isdir(cls.base_dir):
+            return
+        cutoff = time.time() - cls.expiry_seconds
+        for upload_id in os.listdir(cls.base_dir):
+            path = os.path.join(cls.base_dir, upload_id)
+            try:
+                # The chunks directory mtime moves with every chunk written
+                chunks = os.path.join(path, 'chunks')
+                last_activity = os.path.getmtime(chunks if os.path.isdir(chunks) else path)
+                if last_activity < cutoff:
+                    shutil.rmtree(path, ignore_errors=True)
+                    logging.info(f"Removed expired resumable upload {upload_id}")
+            except OSError:
+                continue
@@ -1,15 +1,91 @@
 # services/scheduler_service.py
+import heapq
+import itertools
 import threading
 import time
 import os
 import base64
 import uuid
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 import tweepy
+from models.base import db_session
+from models.scheduler_job import SchedulerJob
 from services.image_service import ImageService
+from services.image_cache_service import ImageCache
+from services.breaker_service import CircuitBreaker
+from config import NEWS_UPDATE_INTERVAL, BREAKER_PUBLISH_INTERVAL
+
+class RetryAfter(Exception):
+    """Raised by a job that knows exactly when it may run again (e.g. a rate-limit reset)"""
+    def __init__(self, seconds, message=None):
+        super().__init__(message or f"Retry after {seconds} seconds")
+        self.seconds = seconds
+
+class RetryPolicy:
+    """Exponential backoff between failed runs of a job"""
+    def __init__(self, initial, factor=2, maximum=None):
+        self.initial = initial
+        self.factor = factor
+        self.maximum = maximum or initial
+
+    def delay(self, failures):
+        return min(self.initial * self.factor ** max(failures - 1, 0), self.maximum)
+
+class ScheduledJob:
+    def __init__(self, name, func, interval, retry, executor):
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.retry = retry
+        self.executor = executor
+        self.next_run = None
+        self.running = False
+        self.triggered = False
+        self.status = 'idle'
+        self.failures = 0
+        self.duration = None
+        self.last_run = None
+        self.last_success = None
+        self.last_error = None
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'interval': self.interval,
+            'status': self.status,
+            'next_run': self.next_run.isoformat() if self.next_run else None,
+            'running': self.running,
+            'failures': self.failures,
+            'duration': self.duration,
+            'last_run': self.last_run.isoformat() if self.last_run else None,
+            'last_success': self.last_success.isoformat() if self.last_success else None,
+            'last_error': self.last_error
+        }
+
+    def to_model(self):
+        return SchedulerJob(
+            name=self.name,
+            status=self.status,
+            last_run=self.last_run,
+            last_success=self.last_success,
+            next_run=self.next_run,
+            duration=self.duration,
+            failures=self.failures,
+            error=self.last_error
+        )
 
 class SchedulerService:
+    """Runs news, Twitter and cleanup jobs from a timer heap.
+
+    The scheduler thread sleeps on a condition until the earliest job is due
+    (or trigger() wakes it), then hands the job to that job's own single-thread
+    executor, so a slow news fetch never delays a tweet. Jobs return False or
+    raise to fail; failures back off by the job's RetryPolicy and RetryAfter
+    overrides the delay. Run state is persisted to scheduler_jobs and resumed
+    on start, so deploys and worker recycles don't re-run everything at once.
+    """
     _instance = None
     
     @classmethod
@@ -19,7 +95,7 @@ class SchedulerService:
         return cls._instance
 
     def __init__(self):
-        self.news_interval = 3600  # 1 hour for news updates
+        self.news_interval = NEWS_UPDATE_INTERVAL  # 1 hour for news updates
         self.twitter_interval = 1800  # 30 minutes for tweets
         self.cleanup_interval = 43200  # 12 hours for cleanup
         self.running = False
@@ -32,81 +108,120 @@ class SchedulerService:
         self.twitter_service = TwitterService()
         self.news_service = NewsService()
         
-        # Initialize timestamps as None to force initial updates
         self.last_news_update = None
-        self.last_twitter_update = datetime.utcnow() - timedelta(minutes=30)  # Make first update happen quickly
-        self.last_cleanup = datetime.utcnow()
-        
-        self._next_news_update = None
-        self._next_twitter_update = self.last_twitter_update + timedelta(seconds=self.twitter_interval)
+        self.last_twitter_update = None
+        self.last_cleanup = None
+
+        self.jobs = {
+            'news': ScheduledJob('news', self.update_news, self.news_interval,
+                                 RetryPolicy(300, maximum=1800), 'news'),
+            'twitter': ScheduledJob('twitter', self.post_to_twitter, self.twitter_interval,
+                                    RetryPolicy(900, maximum=3600), 'twitter'),
+            'cleanup': ScheduledJob('cleanup', self.cleanup_images, self.cleanup_interval,
+                                    RetryPolicy(3600, maximum=3600), 'maintenance'),
+            'breakers': ScheduledJob('breakers', self.publish_breakers, BREAKER_PUBLISH_INTERVAL,
+                                     RetryPolicy(BREAKER_PUBLISH_INTERVAL, maximum=300), 'maintenance')
+        }
+        self._heap = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._executors = {}
         
         self.logger = logging.getLogger(__name__)
 
-    def initialize(self):
-        """Initial fetch of news and Twitter post"""
-        try:
-            # Import here to avoid circular imports
-            from services.news_service import NewsService
-            
-            # Initial news fetch
-            if NewsService.fetch_news(force_breaking=True):
-                self.last_news_update = datetime.utcnow()
-                self._next_news_update = self.last_news_update + timedelta(seconds=self.news_interval)
-                self.logger.info(f"Initial news fetch successful. Next update in {self.news_interval/3600} hours")
-                
-                # Initial Twitter post
-                cached_news = NewsService.get_cached_news()
-                if cached_news and cached_news.get('breaking'):
-                    if self.twitter_service.post_article(cached_news['breaking']):
-                        self.last_twitter_update = datetime.utcnow()
-                        self._next_twitter_update = self.last_twitter_update + timedelta(seconds=self.twitter_interval)
-                        self.logger.info("Initial Twitter post successful")
-        except Exception as e:
-            self.logger.error(f"Initialization error: {e}")
-
     @property
     def next_twitter_update(self):
         """Get next Twitter update time"""
-        current_time = datetime.utcnow()
-        if not self._next_twitter_update or current_time >= self._next_twitter_update:
-            self._next_twitter_update = current_time + timedelta(seconds=self.twitter_interval)
-        return self._next_twitter_update
+        return self._next_run('twitter')
 
     @property
     def next_news_update(self):
-        if not self._next_news_update:
-            current_time = datetime.utcnow()
-            self._next_news_update = current_time + timedelta(seconds=self.news_interval)
-        return self._next_news_update
+        return self._next_run('news')
 
     def get_next_update(self):
         return self.next_news_update
 
+    def _next_run(self, name):
+        job = self.jobs[name]
+        next_run, last_run = job.next_run, job.last_run
+        if not self.running:
+            # Another worker runs the scheduler, its persisted schedule is the real one
+            saved = self.load_state().get(name)
+            if saved:
+                next_run = datetime.fromisoformat(saved['next_run']) if saved['next_run'] else None
+                last_run = datetime.fromisoformat(saved['last_run']) if saved['last_run'] else None
+        if next_run:
+            return next_run
+        # Running right now or scheduler not started: the earliest it can come round again
+        return (last_run or datetime.utcnow()) + timedelta(seconds=job.interval)
+
+    @staticmethod
+    def load_state():
+        """Persisted run state of every job, as written by whichever process runs the scheduler"""
+        try:
+            return {row.name: row.to_dict() for row in SchedulerJob.query.all()}
+        except Exception as e:
+            db_session.rollback()
+            logging.error(f"Error loading scheduler state: {e}")
+            return {}
+
+    def _persist(self, job):
+        """Write a job's run state, called from scheduler and executor threads"""
+        try:
+            db_session.merge(job.to_model())
+            db_session.commit()
+        except Exception as e:
+            db_session.rollback()
+            self.logger.error(f"Error saving {job.name} job state: {e}")
+        finally:
+            db_session.remove()
+
+    def _first_run(self, job, state, now):
+        """When a job should first run after start, resuming its persisted schedule"""
+        if not state:
+            # Never ran anywhere: news and the first tweet right away, cleanup after a full interval
+            return now if job.name != 'cleanup' else now + timedelta(seconds=job.interval)
+
+        job.failures = state['failures'] or 0
+        job.last_error = state['error']
+        job.duration = state['duration']
+        job.last_run = datetime.fromisoformat(state['last_run']) if state['last_run'] else None
+        job.last_success = datetime.fromisoformat(state['last_success']) if state['last_success'] else None
+        job.status = state['status'] or 'idle'
+
+        if job.status == 'running':
+            # The previous process died mid-run, count it as a failure and back off
+            job.failures += 1
+            job.status = 'failed'
+            job.last_error = 'Interrupted by shutdown'
+            return max(now, (job.last_run or now) + timedelta(seconds=job.retry.delay(job.failures)))
+        if state['next_run']:
+            return max(now, datetime.fromisoformat(state['next_run']))
+        return max(now, (job.last_run or now) + timedelta(seconds=job.interval))
+
     def cleanup_images(self):
-        """Delete cached images older than 12 hours"""
+        """Evict least recently used unpinned images down to the cache budget"""
         try:
-            now = datetime.utcnow()
-            image_dir = "static/images/generated"
-            count = 0
-
-            if os.path.exists(image_dir):
-                for filename in os.listdir(image_dir):
-                    filepath = os.path.join(image_dir, filename)
-                    try:
-                        file_modified = datetime.fromtimestamp(os.path.getmtime(filepath))
-                        if now - file_modified > timedelta(hours=12):
-                            os.remove(filepath)
-                            count += 1
-                    except (OSError, IOError) as e:
-                        self.logger.error(f"Error processing file {filepath}: {e}")
-                        continue
-
-            self.logger.info(f"Cleaned up {count} old images")
+            from services.news_service import NewsService
+            from services.job_service import JobService
+
+            count = ImageCache.evict()
+            pruned = NewsService.prune_ledger()
+            if pruned:
+                self.logger.info(f"Pruned {pruned} ingest ledger entries")
+            JobService.reap_stale()
+            self.logger.info(f"Cleaned up {count} old images, cache at {ImageCache.stats()['bytes']} bytes")
+            self.last_cleanup = datetime.utcnow()
             return count
         except Exception as e:
             self.logger.error(f"Error during image cleanup: {e}")
             return 0
 
+    def publish_breakers(self):
+        """Breakers job: share this process's circuit breaker states with the other workers"""
+        CircuitBreaker.publish()
+        return True
+
     def handle_base64_image(self, base64_data):
         """Handle base64 encoded images"""
         try:
@@ -124,136 +239,184 @@ class SchedulerService:
             # Save image
             with open(filepath, 'wb') as f:
                 f.write(image_bytes)
-                  return filepath
+            ImageCache.put(filepath, len(image_bytes))
+            return filepath
         except Exception as e:
             self.logger.error(f"Error handling base64 image: {e}")
             return None
             
-    def run_scheduler(self):
-        """Main scheduler loop"""
-        self.initialize()  # Perform initial updates
-        
+    def update_news(self):
+        """News job: fetch and store the latest articles"""
         from services.news_service import NewsService
-        
-        while self.running:
-            try:
-                current_time = datetime.utcnow()
-                self.logger.info(f"Scheduler running at {current_time}")
 
-                # News update (every 1 hour now)
-                try:
-                    if not self.last_news_update or current_time >= self.next_news_update:
-                        self.logger.info("Running scheduled news update")
-                        if NewsService.fetch_news(force_breaking=True):
-                            self.last_news_update = current_time
-                            self._next_news_update = current_time + timedelta(seconds=self.news_interval)
-                            self.logger.info(f"News updated at {current_time}, next update at {self._next_news_update}")
-                        else:
-                            self.logger.warning("News update failed, will retry in 15 minutes")
-                            self._next_news_update = current_time + timedelta(minutes=15)
-                except Exception as e:
-                    self.logger.error(f"News update error: {e}")
-                    # Even if there's an error, schedule next attempt
-                    self._next_news_update = current_time + timedelta(minutes=15)  # Retry in 15 minutes
-                    self.logger.info(f"Rescheduled news update for {self._next_news_update}")
-
-                # Twitter post (every 30 minutes)
-                try:
-                    if not self.last_twitter_update or current_time >= self.next_twitter_update:
-                        self.logger.info("Time to post to Twitter")
-                        
-                        # First, verify Twitter connection
-                        if not self.twitter_service.check_connection():
-                            self.logger.warning("Twitter connection not available, rebuilding client")
-                            # Recreate Twitter service to reset connection
-                            from services.twitter_service import TwitterService
-                            self.twitter_service = TwitterService()
-                            if not self.twitter_service.check_connection():
-                                self.logger.error("Twitter connection still unavailable after rebuild")
-                                self._next_twitter_update = current_time + timedelta(minutes=15)
-                                continue
-                            
-                        # Get latest news from database directly to ensure freshness
-                        cached_news = NewsService.get_cached_news()
-                        
-                        if not cached_news:
-                            self.logger.warning("No news available for Twitter post")
-                            # Force a news refresh right now
-                            if NewsService.fetch_news(force_breaking=True):
-                                self.logger.info("Forced news refresh successful")
-                                cached_news = NewsService.get_cached_news()
-                            else:
-                                self.logger.error("Forced news refresh failed")
-                                self._next_twitter_update = current_time + timedelta(minutes=15)
-                                continue
-                                
-                        if cached_news:
-                            article = None
-                            # Try to use breaking news first
-                            if cached_news.get('breaking'):
-                                article = cached_news['breaking']
-                                self.logger.info(f"Using breaking news article: {article.title if hasattr(article, 'title') else 'Unknown'}")
-                            # Fall back to other news if no breaking news
-                            elif cached_news.get('other') and len(cached_news['other']) > 0:
-                                article = cached_news['other'][0]
-                                self.logger.info(f"Using regular news article: {article.title if hasattr(article, 'title') else 'Unknown'}")
-                                
-                            if article:
-                                self.logger.info(f"Attempting Twitter post for article: {article.title if hasattr(article, 'title') else 'Unknown'}")
-                                posting_result = self.twitter_service.post_article(article)
-                                if posting_result:
-                                    self.last_twitter_update = current_time
-                                    self._next_twitter_update = current_time + timedelta(seconds=self.twitter_interval)
-                                    self.logger.info(f"Twitter post successful at {current_time}, next post at {self._next_twitter_update}")
-                                else:
-                                    self.logger.warning("Twitter post failed, will retry in 15 minutes")
-                                    self._next_twitter_update = current_time + timedelta(minutes=15)
-                            else:
-                                self.logger.warning("No article available after news refresh")
-                                self._next_twitter_update = current_time + timedelta(minutes=15)
-                        else:
-                            self.logger.warning("Still no news available after refresh")
-                            self._next_twitter_update = current_time + timedelta(minutes=15)
-                            
-                except tweepy.TooManyRequests as e:
-                    retry_after = int(e.response.headers.get('x-rate-limit-reset', 900)) 
-                    self.logger.warning(f"Twitter rate limit hit, waiting {retry_after} seconds")
-                    self._next_twitter_update = current_time + timedelta(seconds=min(retry_after, 900))  # Cap at 15 minutes
-                except Exception as e:
-                    self.logger.error(f"Twitter post error: {str(e)}")
-                    # Schedule retry after a short delay
-                    self._next_twitter_update = current_time + timedelta(minutes=15)
-                    self.logger.info(f"Rescheduled Twitter post for {self._next_twitter_update}")
-
-                # Cleanup (every 12 hours)
-                if (current_time - self.last_cleanup).total_seconds() >= self.cleanup_interval:
-                    self.logger.info("Running scheduled image cleanup")
-                    self.cleanup_images()
-                    self.last_cleanup = current_time
-                    self.logger.info(f"Cleanup completed at {current_time}")
-
-                # Log next scheduled events
-                self.logger.info(f"Next news update: {self._next_news_update}")
-                self.logger.info(f"Next Twitter post: {self._next_twitter_update}")
-                
-                # Sleep for a shorter time and check more frequently
-                time.sleep(30)
+        # Scheduled runs always poll, but join a forced refresh already in flight
+        if NewsService.refresh(min_interval=0) not in ('refreshed', 'joined'):
+            return False
+        self.last_news_update = datetime.utcnow()
+        return True
+
+    def post_to_twitter(self):
+        """Twitter job: post the current breaking (or latest) article"""
+        from services.news_service import NewsService
+        from services.twitter_service import TwitterService, RateLimited
 
-            except Exception as e:
-                self.logger.error(f"Scheduler error: {str(e)}")
-                time.sleep(60)
+        # First, verify Twitter connection
+        if not self.twitter_service.check_connection():
+            self.logger.warning("Twitter connection not available, rebuilding client")
+            # Recreate Twitter service to reset connection
+            self.twitter_service = TwitterService()
+            if not self.twitter_service.check_connection():
+                raise RuntimeError("Twitter connection still unavailable after rebuild")
+
+        # Get latest news from database directly to ensure freshness
+        cached_news = NewsService.get_cached_news()
+        if not cached_news:
+            self.logger.warning("No news available for Twitter post")
+            # Force a news refresh right now, or join the one already running
+            if NewsService.refresh() not in ('refreshed', 'joined', 'fresh'):
+                raise RuntimeError("Forced news refresh failed")
+            cached_news = NewsService.get_cached_news()
+            if not cached_news:
+                raise RuntimeError("Still no news available after refresh")
+
+        # Try to use breaking news first, fall back to other news
+        article = cached_news.get('breaking')
+        if not article and cached_news.get('other'):
+            article = cached_news['other'][0]
+        if not article:
+            raise RuntimeError("No article available after news refresh")
+
+        self.logger.info(f"Attempting Twitter post for article: {getattr(article, 'title', 'Unknown')}")
+        try:
+            posted = self.twitter_service.post_article(article)
+        except RateLimited as e:
+            raise RetryAfter(min(max(e.retry_after, 60), 900), str(e))
+        if not posted:
+            return False
+        self.last_twitter_update = datetime.utcnow()
+        return True
+
+    def _schedule(self, job, when):
+        """Queue a job for `when`; the caller must hold self._condition"""
+        job.next_run = when
+        heapq.heappush(self._heap, (when, next(self._sequence), job.name))
+        self._condition.notify()
+
+    def trigger(self, name):
+        """Run a job as soon as possible instead of waiting for its next slot"""
+        with self._condition:
+            job = self.jobs[name]
+            if job.running:
+                # Run again right after the current run finishes
+                job.triggered = True
+            else:
+                self._schedule(job, datetime.utcnow())
+        self.logger.info(f"Triggered {name} job")
+
+    def _execute(self, job):
+        started = datetime.utcnow()
+        job.last_run = started
+        job.status = 'running'
+        self._persist(job)
+
+        try:
+            if job.func() is False:
+                raise RuntimeError(f"{job.name} job reported failure")
+            job.status = 'succeeded'
+            job.failures = 0
+            job.last_error = None
+            job.last_success = datetime.utcnow()
+            next_run = started + timedelta(seconds=job.interval)
+            self.logger.info(f"{job.name} job completed, next run at {next_run}")
+        except Exception as e:
+            job.status = 'failed'
+            job.failures += 1
+            job.last_error = str(e)
+            delay = e.seconds if isinstance(e, RetryAfter) else job.retry.delay(job.failures)
+            next_run = datetime.utcnow() + timedelta(seconds=delay)
+            self.logger.error(f"{job.name} job failed ({job.failures} in a row): {e}, retrying at {next_run}")
+        job.duration = (datetime.utcnow() - started).total_seconds()
+
+        with self._condition:
+            job.running = False
+            if job.triggered:
+                job.triggered = False
+                next_run = datetime.utcnow()
+            if self.running:
+                self._schedule(job, next_run)
+            else:
+                job.next_run = next_run
+        self._persist(job)
+
+    def run_scheduler(self):
+        """Sleep until the earliest job is due, dispatch it, repeat"""
+        with self._condition:
+            while self.running:
+                if not self._heap:
+                    self._condition.wait()
+                    continue
+
+                due, _, name = self._heap[0]
+                job = self.jobs[name]
+                if job.next_run != due or job.running:
+                    # Superseded by a trigger or reschedule
+                    heapq.heappop(self._heap)
+                    continue
+
+                delay = (due - datetime.utcnow()).total_seconds()
+                if delay > 0:
+                    self._condition.wait(delay)
+                    continue
+
+                heapq.heappop(self._heap)
+                job.next_run = None
+                job.running = True
+                try:
+                    self._executors[job.executor].submit(self._execute, job)
+                except RuntimeError as e:
+                    job.running = False
+                    self.logger.error(f"Could not dispatch {name} job: {e}")
 
     def start(self):
-        """Start the scheduler"""
-        if not self.running:
+        """Start the scheduler, resuming the schedule persisted by the previous run"""
+        if self.running:
+            return
+        saved = self.load_state()
+        db_session.remove()
+
+        with self._condition:
+            if self.running:
+                return
             self.running = True
-            self.thread = threading.Thread(target=self.run_scheduler, daemon=True)
-            self.thread.start()
-            self.logger.info("Scheduler started")
+            self._executors = {
+                name: ThreadPoolExecutor(max_workers=1, thread_name_prefix=f'scheduler-{name}')
+                for name in {job.executor for job in self.jobs.values()}
+            }
+            self._heap = []
+            now = datetime.utcnow()
+            for job in self.jobs.values():
+                self._schedule(job, self._first_run(job, saved.get(job.name), now))
+                self.logger.info(f"{job.name} job scheduled for {job.next_run}")
+
+        self.last_news_update = self.jobs['news'].last_success
+        self.last_twitter_update = self.jobs['twitter'].last_success
+        self.last_cleanup = self.jobs['cleanup'].last_success
+        for job in self.jobs.values():
+            self._persist(job)
+
+        self.thread = threading.Thread(target=self.run_scheduler, name='scheduler', daemon=True)
+        self.thread.start()
+        self.logger.info("Scheduler started")
 
     def stop(self):
         """Stop the scheduler"""
-        self.running = False
+        with self._condition:
+            self.running = False
+            self._condition.notify_all()
+            executors, self._executors = self._executors, {}
         if self.thread:
             self.thread.join()
-            self.logger.info("Scheduler stopped")
\ No newline at end of file
+        for executor in executors.values():
+            # Let an in-flight job finish on its own, don't block on it
+            executor.shutdown(wait=False)
+        self.logger.info("Scheduler stopped")
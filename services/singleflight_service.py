@@ -0,0 +1,112 @@
+# services/singleflight_service.py
+import logging
+import threading
+import time
+import zlib
+from sqlalchemy import text
+from models.base import engine
+from config import SINGLE_FLIGHT_LOCK_NAMESPACE
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.status = 'joined'  # Reported to threads that joined, 'busy' when the leader backed off
+        self.result = None
+
+class SingleFlight:
+    """Coalesces concurrent calls per key so only one runs at a time.
+
+    Threads of one process that arrive while a call is running join it and
+    share its result, or get 'busy' too if it backed off from another
+    process. Across processes the running call holds a Postgres advisory
+    lock (namespace, key), and callers elsewhere wait for it to be released
+    or back off. run() returns (status, result) where status is 'ran',
+    'joined' or 'busy'; result is None when it came from another process or
+    nobody waited for it.
+    """
+    _flights = {}
+    _lock = threading.Lock()
+    poll_interval = 0.5  # Seconds between lock attempts while waiting on another process
+
+    @staticmethod
+    def _lock_key(key):
+        # Signed int4, the second half of a two-key advisory lock
+        value = zlib.crc32(key.encode())
+        return value - 2 ** 32 if value >= 2 ** 31 else value
+
+    @classmethod
+    def run(cls, key, func, wait=True, timeout=60):
+        with cls._lock:
+            flight = cls._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = cls._flights[key] = _Flight()
+
+        if not leader:
+            if wait and flight.done.wait(timeout):
+                return flight.status, flight.result
+            return 'busy', None
+
+        try:
+            connection, status = cls._acquire(key, wait, timeout)
+            if status:
+                flight.status = status
+                return status, None
+            try:
+                flight.result = func()
+                return 'ran', flight.result
+            finally:
+                cls._release(connection, key)
+        finally:
+            with cls._lock:
+                del cls._flights[key]
+            flight.done.set()
+
+    @classmethod
+    def _acquire(cls, key, wait, timeout):
+        """(connection holding the key's advisory lock, None) or, when another process
+        is running the call, (None, 'joined' once it finished or 'busy'). Off Postgres
+        there are no other processes to coordinate with: (None, None)."""
+        if engine.dialect.name != 'postgresql':
+            return None, None
+
+        params = {'namespace': SINGLE_FLIGHT_LOCK_NAMESPACE, 'key': cls._lock_key(key)}
+        try_lock = text("SELECT pg_try_advisory_lock(:namespace, :key)")
+        connection = engine.connect().execution_options(isolation_level='AUTOCOMMIT')
+        try:
+            if connection.execute(try_lock, params).scalar():
+                return connection, None
+
+            # Another process is running it, wait for it to finish instead of running it again
+            status = 'busy'
+            deadline = time.monotonic() + timeout
+            while wait and time.monotonic() < deadline:
+                time.sleep(cls.poll_interval)
+                if connection.execute(try_lock, params).scalar():
+                    connection.execute(text("SELECT pg_advisory_unlock(:namespace, :key)"), params)
+                    status = 'joined'
+                    break
+            connection.close()
+            return None, status
+        except Exception:
+            # It may hold the lock from the wait loop, never hand it back to the pool
+            connection.invalidate()
+            connection.close()
+            raise
+
+    @classmethod
+    def _release(cls, connection, key):
+        if connection is None:
+            return
+        try:
+            connection.execute(
+                text("SELECT pg_advisory_unlock(:namespace, :key)"),
+                {'namespace': SINGLE_FLIGHT_LOCK_NAMESPACE, 'key': cls._lock_key(key)}
+            )
+        except Exception as e:
+            logging.error(f"Error releasing single-flight lock {key}: {e}")
+            # The session still holds the advisory lock, a pooled connection would keep it
+            # until recycled and every later caller would be busy. Discard the connection instead
+            connection.invalidate()
+        finally:
+            connection.close()
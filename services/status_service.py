@@ -0,0 +1,92 @@
+# services/status_service.py
+import logging
+import threading
+import time
+from datetime import datetime
+from models.base import db_session
+
+class StatusRegistry:
+    """In-memory dependency status, refreshed by background probes.
+
+    Each probe runs on its own cadence in one daemon thread and records ok,
+    latency and last-checked time. Readers get the last published dict, which
+    is replaced rather than mutated, so serving it needs no lock or I/O. Until
+    a probe's first run its ok is None (unknown), requests never wait on one.
+    """
+    _probes = {}  # name -> (probe, interval seconds)
+    _results = {}
+    _thread = None
+    _start_lock = threading.Lock()
+    _stop_event = threading.Event()
+
+    @classmethod
+    def register(cls, name, probe, interval):
+        """Add a probe, a callable returning a truthy value when the dependency works"""
+        cls._probes[name] = (probe, interval)
+        results = dict(cls._results)
+        results[name] = {'ok': None, 'latency_ms': None, 'checked_at': None, 'error': None}
+        cls._results = results
+
+    @classmethod
+    def snapshot(cls):
+        return cls._results
+
+    @classmethod
+    def is_ok(cls, name):
+        """True or False from the last probe, None before the first one finished"""
+        result = cls._results.get(name)
+        return result['ok'] if result else None
+
+    @classmethod
+    def _check(cls, name):
+        """Run one probe and publish its result, on the probe thread only"""
+        probe, _ = cls._probes[name]
+        started = time.perf_counter()
+        error = None
+        try:
+            ok = bool(probe())
+        except Exception as e:
+            ok = False
+            error = str(e).splitlines()[0] if str(e) else type(e).__name__
+            logging.error(f"Status probe {name} failed: {e}")
+        finally:
+            # The probe thread's own session, don't keep it around between probes
+            db_session.remove()
+
+        results = dict(cls._results)
+        results[name] = {
+            'ok': ok,
+            'latency_ms': round((time.perf_counter() - started) * 1000, 1),
+            'checked_at': datetime.utcnow().isoformat(),
+            'error': error
+        }
+        cls._results = results
+        return ok
+
+    @classmethod
+    def start(cls):
+        """Start probing in the background, the first pass runs right away on the probe thread"""
+        if cls._thread is not None:
+            return
+        with cls._start_lock:
+            if cls._thread is not None:
+                return
+            cls._thread = threading.Thread(target=cls._run, name='status-probes', daemon=True)
+            cls._thread.start()
+            logging.info(f"Status probes started: {', '.join(cls._probes)}")
+
+    @classmethod
+    def stop(cls):
+        cls._stop_event.set()
+
+    @classmethod
+    def _run(cls):
+        now = time.monotonic()
+        next_due = {name: now for name in cls._probes}
+        while not cls._stop_event.is_set():
+            now = time.monotonic()
+            for name, due in next_due.items():
+                if due <= now:
+                    cls._check(name)
+                    next_due[name] = time.monotonic() + cls._probes[name][1]
+            cls._stop_event.wait(max(0.0, min(next_due.values()) - time.monotonic()))
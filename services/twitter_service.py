@@ -18,6 +18,12 @@ import concurrent.futures
 from concurrent.futures import ThreadPoolExecutor
 from functools import partial
 
+class RateLimited(Exception):
+    """Twitter answered 429, retry_after is the seconds until the window reopens"""
+    def __init__(self, retry_after):
+        super().__init__(f"Twitter rate limit hit, retry in {retry_after:.0f}s")
+        self.retry_after = retry_after
+
 class TwitterService:
     def __init__(self):
         try:
@@ -27,7 +33,7 @@ class TwitterService:
                 consumer_secret=TWITTER_API_SECRET,
                 access_token=TWITTER_ACCESS_TOKEN,
                 access_token_secret=TWITTER_ACCESS_SECRET,
-                wait_on_rate_limit=True  # Handle rate limits automatically
+                wait_on_rate_limit=False  # Surface 429s as RateLimited, callers reschedule instead of sleeping
             )
             
             # Initialize V1 API for media uploads
@@ -141,20 +147,20 @@ class TwitterService:
             
         except Exception as e:
             logging.error(f"Rate limit handling error: {e}")
-            return 60  # Default wait    def post_article(self, article):
-        """Post article with adjusted timeouts"""
+            return 60  # Default wait
+
+    def post_article(self, article):
+        """Post an article now, True once posted.
+
+        How often to post is up to the caller (the scheduler's twitter job).
+        Raises RateLimited when Twitter refuses the post with a 429.
+        """
         try:
             if not self.client or not self.v1_api:
                 logging.error("Twitter clients not initialized")
                 return False
 
             current_time = datetime.utcnow()
-            
-            if self.last_post_time:
-                time_since_last = (current_time - self.last_post_time).total_seconds()
-                if time_since_last < self.post_interval:
-                    logging.info(f"Skipping post, last post was {time_since_last}s ago (interval: {self.post_interval}s)")
-                    return False
 
             # Generate tweet text
             text = self._generate_tweet_text(article)
@@ -169,10 +175,14 @@ class TwitterService:
                 else:
                     logging.warning("Post failed")
                     return False
+            except RateLimited:
+                raise
             except Exception as e:
                 logging.error(f"Post error: {str(e)}")
                 return False
                 
+        except RateLimited:
+            raise
         except Exception as e:
             logging.error(f"Post article error: {e}")
             return False
@@ -201,11 +211,9 @@ class TwitterService:
                     logging.warning(f"Empty response or missing data from Twitter API")
                     
             except tweepy.TooManyRequests as e:
+                # Retrying within seconds can't succeed, let the caller come back when the window reopens
                 logging.warning(f"Rate limited on attempt {attempt+1}: {str(e)}")
-                wait_time = self._handle_rate_limit(e)
-                if wait_time:
-                    time.sleep(min(wait_time, 5))  # Limited sleep time
-                continue
+                raise RateLimited(self._handle_rate_limit(e) or 60)
             
             except tweepy.Unauthorized as e:
                 logging.error(f"Twitter authentication error: {str(e)}")
@@ -221,7 +229,8 @@ class TwitterService:
                     text = text[:250] + "..."
                     continue
                 return False
-                  except Exception as e:
+
+            except Exception as e:
                 logging.error(f"Tweet error on attempt {attempt+1}: {str(e)}")
                 time.sleep(min(2 ** attempt, 5))  # Limited exponential backoff
                 continue
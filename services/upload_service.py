@@ -0,0 +1,82 @@
+# services/upload_service.py
+import os
+import shutil
+import tempfile
+import logging
+from cloudinary import uploader
+from flask import Request
+from config import UPLOAD_TMP_DIR, UPLOAD_CHUNK_SIZE, UPLOAD_BUFFER_SIZE
+
+PART_PREFIX = 'upload_part_'
+
+class SpoolingRequest(Request):
+    """Request that parses uploaded files into named temp files.
+
+    Werkzeug's default parts are anonymous temp files, so spooling one meant
+    copying the whole upload again on the request thread. Named parts can be
+    taken over by UploadService.spool() with a rename; the rest are removed
+    when the request closes.
+    """
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        part = tempfile.NamedTemporaryFile('wb+', prefix=PART_PREFIX, dir=UPLOAD_TMP_DIR, delete=False)
+        if not hasattr(self, '_upload_parts'):
+            self._upload_parts = []
+        self._upload_parts.append(part.name)
+        return part
+
+    def close(self):
+        try:
+            super().close()
+        finally:
+            # Parts spool() took over were renamed away and are skipped
+            UploadService.discard(*getattr(self, '_upload_parts', ()))
+
+class UploadService:
+    """Disk-backed, chunked transfer of uploads to Cloudinary.
+
+    Memory per upload stays around UPLOAD_BUFFER_SIZE while spooling and
+    UPLOAD_CHUNK_SIZE while sending, whatever the size of the file.
+    """
+
+    @staticmethod
+    def spool(file_storage):
+        """Move an uploaded file to its own temp file and return its path.
+
+        A part already on disk (see SpoolingRequest) is renamed, anything else
+        is copied in fixed-size blocks. The caller owns the file and must
+        discard() it.
+        """
+        suffix = os.path.splitext(file_storage.filename or '')[1].lower()
+        fd, path = tempfile.mkstemp(prefix='upload_', suffix=suffix, dir=UPLOAD_TMP_DIR)
+        part = getattr(file_storage.stream, 'name', None)
+        try:
+            if isinstance(part, str) and os.path.basename(part).startswith(PART_PREFIX):
+                os.close(fd)
+                file_storage.stream.close()
+                os.replace(part, path)
+            else:
+                with os.fdopen(fd, 'wb') as f:
+                    shutil.copyfileobj(file_storage.stream, f, UPLOAD_BUFFER_SIZE)
+        except Exception:
+            UploadService.discard(path)
+            raise
+        return path
+
+    @staticmethod
+    def discard(*paths):
+        """Remove spooled files, ignoring ones already gone"""
+        for path in paths:
+            if not path:
+                continue
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logging.warning(f"Could not remove spooled upload {path}: {e}")
+
+    @staticmethod
+    def upload_large(path, **options):
+        """Upload a local file to Cloudinary in UPLOAD_CHUNK_SIZE parts"""
+        return uploader.upload_large(path, chunk_size=UPLOAD_CHUNK_SIZE, **options)
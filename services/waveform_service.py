@@ -0,0 +1,213 @@
+# services/waveform_service.py
+import hashlib
+import logging
+import math
+import os
+import struct
+import subprocess
+import tempfile
+import threading
+from io import BytesIO
+import numpy as np
+from cloudinary import uploader
+from config import (
+    FFMPEG_BINARY,
+    WAVEFORM_SAMPLE_RATE,
+    WAVEFORM_PEAKS_COUNT,
+    WAVEFORM_DECODE_TIMEOUT,
+    WAVEFORM_PYRAMID_LEVELS,
+    WAVEFORM_DIR
+)
+from services.http_service import HttpClient
+
+class WaveformService:
+    """Server-side waveform extraction so browsers never decode audio just to draw it.
+
+    Pyramid file layout (little-endian), fetched by clients with HTTP Range:
+        header  '<4sHHIQ'  magic b'PWAV', version, level count, sample rate, total samples
+        levels  '<III'     samples per pixel, byte offset, pair count (one entry per level)
+        data    int8       interleaved (min, max) pairs per pixel, finest level first
+    """
+    read_size = 64 * 1024  # Bytes of PCM pulled from ffmpeg per read
+
+    PYRAMID_MAGIC = b'PWAV'
+    PYRAMID_VERSION = 1
+    PYRAMID_HEADER = struct.Struct('<4sHHIQ')
+    PYRAMID_LEVEL = struct.Struct('<III')
+
+    @classmethod
+    def iter_pcm(cls, source, sample_rate=WAVEFORM_SAMPLE_RATE, timeout=WAVEFORM_DECODE_TIMEOUT):
+        """Decode any ffmpeg-readable file or URL into mono int16 PCM blocks.
+
+        ffmpeg is killed if the whole decode takes longer than timeout seconds.
+        """
+        # stderr goes to a file, a pipe nobody reads fills up and stalls ffmpeg
+        stderr = tempfile.TemporaryFile()
+        process = subprocess.Popen(
+            [
+                FFMPEG_BINARY, '-v', 'error', '-nostdin',
+                '-i', source,
+                '-ac', '1', '-ar', str(sample_rate),
+                '-f', 's16le', '-'
+            ],
+            stdout=subprocess.PIPE,
+            stderr=stderr
+        )
+        expired = threading.Event()
+
+        def expire():
+            expired.set()
+            process.kill()
+
+        watchdog = threading.Timer(timeout, expire)
+        watchdog.daemon = True
+        watchdog.start()
+        try:
+            leftover = b''
+            while True:
+                data = process.stdout.read(cls.read_size)
+                if not data:
+                    break
+                data = leftover + data
+                usable = len(data) - len(data) % 2
+                leftover = data[usable:]
+                yield np.frombuffer(data[:usable], dtype='<i2')
+
+            if process.wait() != 0:
+                if expired.is_set():
+                    raise RuntimeError(f"ffmpeg timed out after {timeout}s decoding {source}")
+                stderr.seek(0)
+                error = stderr.read().decode(errors='replace').strip()
+                raise RuntimeError(f"ffmpeg failed to decode {source}: {error}")
+        finally:
+            watchdog.cancel()
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+            process.stdout.close()
+            stderr.close()
+
+    @classmethod
+    def decode_min_max(cls, source, samples_per_pixel=WAVEFORM_PYRAMID_LEVELS[0],
+                       sample_rate=WAVEFORM_SAMPLE_RATE):
+        """Stream-decode source into per-pixel int16 (min, max) arrays.
+
+        Each PCM block is reduced with a single reshape, so memory is bounded by
+        the finest level (total samples / samples_per_pixel) and not the audio.
+        """
+        mins, maxs = [], []
+        carry = np.empty(0, dtype=np.int16)
+        total_samples = 0
+        for block in cls.iter_pcm(source, sample_rate):
+            total_samples += len(block)
+            carry = np.concatenate((carry, block))
+            full = len(carry) - len(carry) % samples_per_pixel
+            if full:
+                windows = carry[:full].reshape(-1, samples_per_pixel)
+                mins.append(windows.min(axis=1))
+                maxs.append(windows.max(axis=1))
+                carry = carry[full:]
+        if len(carry):
+            mins.append(carry.min(keepdims=True))
+            maxs.append(carry.max(keepdims=True))
+
+        if not total_samples:
+            raise ValueError(f"No audio decoded from {source}")
+        return np.concatenate(mins), np.concatenate(maxs), total_samples
+
+    @staticmethod
+    def downsample(mins, maxs, factor):
+        """Merge every `factor` pixels of a level into one pixel of a coarser level"""
+        pad = -len(mins) % factor
+        mins = np.pad(mins, (0, pad)).reshape(-1, factor).min(axis=1)
+        maxs = np.pad(maxs, (0, pad)).reshape(-1, factor).max(axis=1)
+        return mins, maxs
+
+    @classmethod
+    def normalize_peaks(cls, mins, maxs, num_peaks=WAVEFORM_PEAKS_COUNT):
+        """Normalized (0..1) amplitude array with at most num_peaks points"""
+        amplitude = np.maximum(np.abs(mins.astype(np.int32)), np.abs(maxs.astype(np.int32)))
+        group = max(1, math.ceil(len(amplitude) / num_peaks))
+        amplitude = np.pad(amplitude, (0, -len(amplitude) % group)).reshape(-1, group).max(axis=1)
+        loudest = amplitude.max() if len(amplitude) else 0
+        normalized = amplitude / loudest if loudest else np.zeros(len(amplitude))
+        return [round(float(p), 3) for p in normalized]
+
+    @classmethod
+    def encode_pyramid(cls, mins, maxs, total_samples, sample_rate=WAVEFORM_SAMPLE_RATE,
+                       levels=WAVEFORM_PYRAMID_LEVELS):
+        """Pack the finest (min, max) level and its coarser levels into the pyramid format"""
+        finest = levels[0]
+        payloads = []
+        for samples_per_pixel in levels:
+            level_mins, level_maxs = cls.downsample(mins, maxs, samples_per_pixel // finest)
+            # int16 -> int8 keeps the shape of the waveform at a quarter of the size
+            pairs = np.empty(len(level_mins) * 2, dtype=np.int8)
+            pairs[0::2] = np.clip(level_mins.astype(np.int32) >> 8, -128, 127)
+            pairs[1::2] = np.clip(level_maxs.astype(np.int32) >> 8, -128, 127)
+            payloads.append((samples_per_pixel, pairs))
+
+        offset = cls.PYRAMID_HEADER.size + cls.PYRAMID_LEVEL.size * len(payloads)
+        output = BytesIO()
+        output.write(cls.PYRAMID_HEADER.pack(
+            cls.PYRAMID_MAGIC, cls.PYRAMID_VERSION, len(payloads), sample_rate, total_samples
+        ))
+        for samples_per_pixel, pairs in payloads:
+            output.write(cls.PYRAMID_LEVEL.pack(samples_per_pixel, offset, len(pairs) // 2))
+            offset += len(pairs)
+        for _, pairs in payloads:
+            output.write(pairs.tobytes())
+        return output.getvalue()
+
+    @classmethod
+    def build_waveform(cls, source, num_peaks=WAVEFORM_PEAKS_COUNT):
+        """Decode once and produce both the peaks array and the binary pyramid"""
+        mins, maxs, total_samples = cls.decode_min_max(source)
+        pyramid = cls.encode_pyramid(mins, maxs, total_samples)
+        logging.info(f"Built waveform for {source}: {len(pyramid)} byte pyramid")
+        return {
+            'peaks': cls.normalize_peaks(mins, maxs, num_peaks),
+            'duration': total_samples / WAVEFORM_SAMPLE_RATE,
+            'pyramid': pyramid
+        }
+
+    @staticmethod
+    def pyramid_public_id(audio_public_id):
+        """Cloudinary raw public id of the pyramid belonging to an audio upload"""
+        return f"waveforms/{audio_public_id.replace('/', '_')}.pwav"
+
+    @classmethod
+    def store_pyramid(cls, pyramid, audio_public_id):
+        """Upload a pyramid next to its audio and return its URL"""
+        result = uploader.upload(
+            BytesIO(pyramid),
+            resource_type='raw',
+            public_id=cls.pyramid_public_id(audio_public_id),
+            overwrite=True
+        )
+        path = cls.local_pyramid_path(result['secure_url'])
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(pyramid)
+        return result['secure_url']
+
+    @staticmethod
+    def local_pyramid_path(waveform_url):
+        return os.path.join(WAVEFORM_DIR, f"{hashlib.md5(waveform_url.encode()).hexdigest()}.pwav")
+
+    @classmethod
+    def get_local_pyramid(cls, waveform_url):
+        """Local copy of a stored pyramid, downloaded once per container"""
+        path = cls.local_pyramid_path(waveform_url)
+        if os.path.exists(path):
+            return path
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with HttpClient.stream('cloudinary', waveform_url) as response:
+            response.raise_for_status()
+            with open(temp_path, 'wb') as f:
+                for chunk in response.iter_content(chunk_size=cls.read_size):
+                    f.write(chunk)
+        os.replace(temp_path, path)
+        return path
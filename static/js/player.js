@@ -52,8 +52,8 @@ document.addEventListener('DOMContentLoaded', () => {
     }
 
     // Initialize players - add null check
-    const players = document.querySelectorAll('.audio-player');
-    if (players.length === 0) {
+    const initialPlayers = document.querySelectorAll('.audio-player');
+    if (initialPlayers.length === 0) {
         // No players found on this page, exit early
         return;
     }
@@ -63,7 +63,13 @@ document.addEventListener('DOMContentLoaded', () => {
     let currentPlayingIndex = -1;
     const playedInSession = new Set();
 
-    players.forEach((player, index) => {
+    // Players in page order, grows as the feed loads more podcasts
+    const players = [];
+
+    function setupPlayer(player) {
+        if (player.dataset.initialized) return;
+        player.dataset.initialized = 'true';
+
         const audio = player.querySelector('audio');
         const container = player.querySelector('.waveform-container');
         const playButton = player.querySelector('.play-button');
@@ -71,6 +77,9 @@ document.addEventListener('DOMContentLoaded', () => {
 
         if (!audio || !container) return;
 
+        players.push(player);
+        const index = players.length - 1;
+
         // Create canvas for gradient
         const canvas = document.createElement('canvas');
         const ctx = canvas.getContext('2d');
@@ -93,9 +102,10 @@ document.addEventListener('DOMContentLoaded', () => {
         progressGradient.addColorStop((canvas.height * 0.7 + 3) / canvas.height, '#F6B094'); // Bottom color
         progressGradient.addColorStop(1, '#F6B094'); // Bottom color
 
-        // Create the waveform
+        // Create the waveform on the page's own <audio> element (preload="none")
         const wavesurfer = WaveSurfer.create({
             container: container,
+            media: audio,
             waveColor: '#656666', // Light gray
             progressColor: '#333333', // Dark gray for progress
             barWidth: 2,
@@ -103,10 +113,11 @@ document.addEventListener('DOMContentLoaded', () => {
             barGap: 2,
             height: 40,
             normalize: true,
-            url: audio.src,
         });
 
         wavesurfers.push(wavesurfer);
+        loadWaveform(wavesurfer, player, audio);
+        enablePyramidZoom(wavesurfer, player, container);
 
         // Play/pause handling with single player logic
         playButton.addEventListener('click', () => {
@@ -401,7 +412,118 @@ document.addEventListener('DOMContentLoaded', () => {
             }
         `;
         document.head.appendChild(style);
-    });
+    }
+
+    // Draw from server-computed peaks so no audio is downloaded or decoded before play,
+    // falling back to client-side decoding when peaks aren't available yet
+    async function loadWaveform(wavesurfer, player, audio) {
+        const peaksUrl = player.dataset.peaksUrl;
+        if (peaksUrl) {
+            try {
+                const response = await fetch(peaksUrl);
+                if (response.ok) {
+                    const data = await response.json();
+                    if (data.peaks && data.peaks.length && data.duration) {
+                        wavesurfer.load(audio.src, [data.peaks], data.duration);
+                        return;
+                    }
+                }
+            } catch (error) {
+                console.error('Error loading waveform peaks:', error);
+            }
+        }
+        wavesurfer.load(audio.src);
+    }
+
+    // Ctrl/Cmd + wheel over a waveform zooms into a detail view drawn from the
+    // waveform pyramid, fetching only the level and time window on screen
+    function enablePyramidZoom(wavesurfer, player, container) {
+        const url = player.dataset.waveformUrl;
+        if (!url) return;
+
+        const pyramid = new WaveformPyramid(url);
+        const canvas = document.createElement('canvas');
+        canvas.className = 'waveform-zoom absolute left-0 top-0 w-full h-full hidden';
+        canvas.style.background = '#1a1a1a';
+        container.appendChild(canvas);
+
+        let pixelsPerSecond = 0; // 0 = fit to width, the regular WaveSurfer view
+        let windowStart = 0;
+        let drawing = false;
+
+        async function draw() {
+            if (!pixelsPerSecond || drawing) return;
+            drawing = true;
+            try {
+                const width = canvas.clientWidth;
+                const height = canvas.clientHeight;
+                canvas.width = width;
+                canvas.height = height;
+
+                const span = width / pixelsPerSecond;
+                const currentTime = wavesurfer.getCurrentTime();
+                windowStart = Math.max(0, Math.min(currentTime - span / 2, pyramid.header.duration - span));
+
+                const level = pyramid.levelFor(pixelsPerSecond);
+                const { first, pairs } = await pyramid.window(level, windowStart, windowStart + span);
+                const pairCount = pairs.length / 2;
+
+                const ctx = canvas.getContext('2d');
+                ctx.clearRect(0, 0, width, height);
+                const middle = height / 2;
+                const scale = middle / 128;
+                const playhead = (currentTime - windowStart) * pixelsPerSecond;
+
+                for (let x = 0; x < width; x++) {
+                    const from = Math.floor((windowStart + x / pixelsPerSecond) * level.pixelsPerSecond) - first;
+                    const to = Math.max(from + 1, Math.floor((windowStart + (x + 1) / pixelsPerSecond) * level.pixelsPerSecond) - first);
+                    let min = 0;
+                    let max = 0;
+                    for (let i = Math.max(0, from); i < Math.min(to, pairCount); i++) {
+                        min = Math.min(min, pairs[i * 2]);
+                        max = Math.max(max, pairs[i * 2 + 1]);
+                    }
+                    ctx.fillStyle = x < playhead ? '#333333' : '#656666';
+                    ctx.fillRect(x, middle - max * scale, 1, Math.max(1, (max - min) * scale));
+                }
+            } catch (error) {
+                console.error('Error drawing zoomed waveform:', error);
+            } finally {
+                drawing = false;
+            }
+        }
+
+        container.addEventListener('wheel', async (e) => {
+            if (!e.ctrlKey && !e.metaKey) return;
+            e.preventDefault();
+            try {
+                const header = await pyramid.load();
+                const fit = container.clientWidth / header.duration;
+                const next = (pixelsPerSecond || fit) * (e.deltaY < 0 ? 1.5 : 1 / 1.5);
+                // Allow up to 4 screen pixels per pair of the finest level
+                pixelsPerSecond = next <= fit ? 0 : Math.min(next, header.levels[0].pixelsPerSecond * 4);
+                canvas.classList.toggle('hidden', !pixelsPerSecond);
+                draw();
+            } catch (error) {
+                console.error('Waveform zoom error:', error);
+            }
+        }, { passive: false });
+
+        canvas.addEventListener('click', (e) => {
+            wavesurfer.setTime(windowStart + e.offsetX / pixelsPerSecond);
+            draw();
+        });
+
+        wavesurfer.on('audioprocess', draw);
+        wavesurfer.on('seeking', draw);
+    }
+
+    initialPlayers.forEach(setupPlayer);
+
+    // Initialize players added to the page after load (e.g. infinite scroll)
+    function initAudioPlayers(root = document) {
+        root.querySelectorAll('.audio-player').forEach(setupPlayer);
+    }
 
     // Update view count
     function updateViewCount(podcastId) {
@@ -543,6 +665,7 @@ document.addEventListener('DOMContentLoaded', () => {
     window.sharePodcast = sharePodcast;
     window.updateViewCount = updateViewCount;
     window.embedPodcast = embedPodcast;
+    window.initAudioPlayers = initAudioPlayers;
 
     // Initialize like button states
     likedPodcasts.forEach(podcastId => {
@@ -610,6 +733,7 @@ async function embedPodcast(podcastId) {
 
 // Add to window object
 window.embedPodcast = embedPodcast;
+window.formatTimeAgo = formatTimeAgo;
 
 // Add at the top level, after the DOMContentLoaded listener declaration
 function createPodcastElement(podcast) {
@@ -674,6 +798,97 @@ function showAdminToast(message, type = 'success') {
     }, 3000);
 }
 
+// Reader for the binary waveform pyramid served by /podcast/<id>/waveform,
+// layout documented in services/waveform_service.py
+const PYRAMID_HEADER_PROBE = 256; // Bytes, covers the header of up to 19 levels
+const PYRAMID_CHUNK_PAIRS = 4096; // Pairs fetched per range request
+
+class WaveformPyramid {
+    constructor(url) {
+        this.url = url;
+        this.header = null;
+        this.chunks = new Map();
+    }
+
+    async range(start, end) {
+        const response = await fetch(this.url, { headers: { Range: `bytes=${start}-${end}` } });
+        if (!response.ok) {
+            throw new Error(`Waveform request failed with status ${response.status}`);
+        }
+        const buffer = await response.arrayBuffer();
+        // A server that ignores Range sends the whole file
+        return response.status === 206 ? buffer : buffer.slice(start, end + 1);
+    }
+
+    async load() {
+        if (this.header) return this.header;
+
+        const view = new DataView(await this.range(0, PYRAMID_HEADER_PROBE - 1));
+        const magic = String.fromCharCode(...new Uint8Array(view.buffer, 0, 4));
+        if (magic !== 'PWAV') throw new Error('Invalid waveform pyramid');
+
+        const levelCount = view.getUint16(6, true);
+        const sampleRate = view.getUint32(8, true);
+        const totalSamples = Number(view.getBigUint64(12, true));
+        const levels = [];
+        for (let i = 0; i < levelCount; i++) {
+            const base = 20 + i * 12;
+            const samplesPerPixel = view.getUint32(base, true);
+            levels.push({
+                index: i,
+                samplesPerPixel,
+                offset: view.getUint32(base + 4, true),
+                pairCount: view.getUint32(base + 8, true),
+                pixelsPerSecond: sampleRate / samplesPerPixel
+            });
+        }
+
+        this.header = { sampleRate, duration: totalSamples / sampleRate, levels };
+        return this.header;
+    }
+
+    // Coarsest level that still has at least one pair per rendered pixel
+    levelFor(pixelsPerSecond) {
+        const levels = this.header.levels; // Finest first
+        for (let i = levels.length - 1; i >= 0; i--) {
+            if (levels[i].pixelsPerSecond >= pixelsPerSecond) return levels[i];
+        }
+        return levels[0];
+    }
+
+    // Interleaved (min, max) int8 pairs of a level covering [startTime, endTime]
+    async window(level, startTime, endTime) {
+        const first = Math.max(0, Math.floor(startTime * level.pixelsPerSecond));
+        const last = Math.min(level.pairCount, Math.ceil(endTime * level.pixelsPerSecond));
+        const pairs = new Int8Array(Math.max(0, last - first) * 2);
+
+        for (let chunk = Math.floor(first / PYRAMID_CHUNK_PAIRS); chunk * PYRAMID_CHUNK_PAIRS < last; chunk++) {
+            const data = await this.chunk(level, chunk);
+            const chunkStart = chunk * PYRAMID_CHUNK_PAIRS;
+            const from = Math.max(first, chunkStart);
+            const to = Math.min(last, chunkStart + data.length / 2);
+            pairs.set(data.subarray((from - chunkStart) * 2, (to - chunkStart) * 2), (from - first) * 2);
+        }
+        return { first, pairs };
+    }
+
+    chunk(level, index) {
+        const key = `${level.index}:${index}`;
+        if (!this.chunks.has(key)) {
+            const startPair = index * PYRAMID_CHUNK_PAIRS;
+            const endPair = Math.min(level.pairCount, startPair + PYRAMID_CHUNK_PAIRS);
+            const request = this.range(level.offset + startPair * 2, level.offset + endPair * 2 - 1)
+                .then(buffer => new Int8Array(buffer))
+                .catch(error => {
+                    this.chunks.delete(key);
+                    throw error;
+                });
+            this.chunks.set(key, request);
+        }
+        return this.chunks.get(key);
+    }
+}
+
 // Add at the beginning of your player.js file, after DOMContentLoaded
 const likedPodcasts = new Set(JSON.parse(localStorage.getItem('likedPodcasts') || '[]'));
 
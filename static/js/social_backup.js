@@ -33,7 +33,8 @@ function initSocialBackup() {
     // Check if primary systems are working first
     checkPrimarySystemStatus()
         .then(status => {
-            if (!status.twitterWorking || !status.newsWorking) {
+            // null means the server hasn't finished checking yet, only false is a failure
+            if (status.twitterWorking === false || status.newsWorking === false) {
                 console.log('Primary systems unavailable, activating backup');
                 startBackupSystems();
             } else {
@@ -0,0 +1,54 @@
+# tests/test_news_snapshot.py
+import os
+import tempfile
+import threading
+import unittest
+from datetime import datetime, timedelta
+
+_tmp = tempfile.mkdtemp(prefix='news_snapshot_test_')
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(_tmp, 'app.db')}"
+os.environ['IMAGE_CACHE_MANIFEST'] = os.path.join(_tmp, 'image_cache.sqlite3')
+
+import app  # noqa: E402  Registers the teardown hooks and page cache like production
+from models.base import Base, db_session, engine  # noqa: E402
+from models.news import NewsArticle  # noqa: E402
+from services.image_cache_service import ImageCache  # noqa: E402
+from services.news_service import NewsService  # noqa: E402
+
+class SaveSnapshotTest(unittest.TestCase):
+    """save_snapshot runs on the scheduler thread, with no request or app context"""
+
+    @classmethod
+    def setUpClass(cls):
+        Base.metadata.create_all(bind=engine)
+
+    def test_pins_live_images_outside_request_context(self):
+        image_url = '/static/images/generated/snapshot_test.jpg'
+        ImageCache.put(os.path.join(_tmp, 'snapshot_test.jpg'), size=10)
+        errors = []
+
+        def news_job():
+            try:
+                article = NewsArticle(title='Breaking', url='https://example.com/a',
+                                      image_url=image_url, published_at=datetime.utcnow())
+                db_session.add(article)
+                db_session.commit()
+                with self.assertNoLogs(level='ERROR'):
+                    NewsService.save_snapshot(db_session, article, [],
+                                              next_update=datetime.utcnow() + timedelta(hours=1))
+            except Exception as e:
+                errors.append(e)
+            finally:
+                db_session.remove()
+
+        thread = threading.Thread(target=news_job)
+        thread.start()
+        thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(NewsService.get_snapshot()['breaking']['image_url'], image_url)
+        self.assertEqual(ImageCache.existing([image_url]), {image_url})
+        self.assertEqual(ImageCache.stats()['pinned'], 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -12,19 +12,10 @@ logging.basicConfig(
 try:
     logging.info("Initializing application in production mode...")
     
-    # Initialize app with database
+    # Initialize app with database and join scheduler leader election.
+    # The elected worker fetches the initial news, the others read it from the database
     init_app(app)
-    
-    # Import and initialize news service
-    from services.news_service import NewsService
-    NewsService.fetch_news(force_breaking=True)
-    logging.info("News service initialized and fetched initial news")
-    
-    # Import and initialize scheduler
-    from services.scheduler_service import SchedulerService
-    scheduler = SchedulerService.get_instance()
-    scheduler.start()
-    logging.info("Scheduler service started successfully")
+    logging.info("Scheduler leader election started")
     
     # Test Twitter connection
     from services.twitter_service import TwitterService